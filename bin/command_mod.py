@@ -15,8 +15,8 @@ import sys
 from pathlib import Path
 from typing import Any, List, Sequence, Union
 
-RELEASE = '2.7.3'
-VERSION = 20260628
+RELEASE = '2.8.0'
+VERSION = 20261019
 
 
 class Command:
@@ -124,7 +124,7 @@ class Command:
                 version = str(
                     path
                 ).split('-glibc_')[1].split('-')[0].split('/')[0]
-                if LooseVersion(_System.get_glibc()) >= LooseVersion(version):
+                if version_key(_System.get_glibc()) >= version_key(version):
                     paths_new.append(path)
             else:
                 paths_new.append(path)
@@ -350,21 +350,32 @@ class CommandFile(Command):
         )
 
 
+@functools.lru_cache(maxsize=65536)
+def version_key(version: str) -> tuple:
+    """
+    Return sortable version tokens tuple (use with "sorted(key=...)").
+
+    1.1 < 1.2b2 < 1.2rc1 < 1.2 < 1.2+git20220418 < 1.2-2 < 1.2.1 < 1.2a < 1.10
+    """
+    tokens = re.split(r'([\D]+)', '• '+version.lower())[1:]
+    tokens = [' '+x if x.isalpha() else x for x in tokens]
+    if tokens[-1] == '':
+        tokens[-2] = tokens[-2][1:]
+
+    return tuple([int(x) if x.isdigit() else x for x in tokens] + [' •'])
+
+
 class LooseVersion:
     """
     This class store version as sortable tokens.
 
     1.1 < 1.2b2 < 1.2rc1 < 1.2 < 1.2+git20220418 < 1.2-2 < 1.2.1 < 1.2a < 1.10
     """
+    __slots__ = ('_version', '_key')
 
     def __init__(self, version: str) -> None:
         self._version = version
-        tokens = re.split(r'([\D]+)', '• '+version.lower())[1:]
-        tokens = [' '+x if x.isalpha() else x for x in tokens]
-        if tokens[-1] == '':
-            tokens[-2] = tokens[-2][1:]
-
-        self._tokens = [int(x) if x.isdigit() else x for x in tokens] + [' •']
+        self._key = version_key(version)
 
     def get_version(self) -> str:
         """
@@ -376,32 +387,41 @@ class LooseVersion:
         """
         Return version tokens.
         """
-        return self._tokens
+        return list(self._key)
+
+    def get_key(self) -> tuple:
+        """
+        Return version tokens tuple.
+        """
+        return self._key
 
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, LooseVersion):
             return NotImplemented
-        return self.get_tokens() < other.get_tokens()
+        return self._key < other._key
 
     def __le__(self, other: object) -> bool:
         if not isinstance(other, LooseVersion):
             return NotImplemented
-        return self.get_tokens() <= other.get_tokens()
+        return self._key <= other._key
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, LooseVersion):
             return NotImplemented
-        return self.get_tokens() == other.get_tokens()
+        return self._key == other._key
 
     def __ge__(self, other: object) -> bool:
         if not isinstance(other, LooseVersion):
             return NotImplemented
-        return self.get_tokens() >= other.get_tokens()
+        return self._key >= other._key
 
     def __gt__(self, other: object) -> bool:
         if not isinstance(other, LooseVersion):
             return NotImplemented
-        return self.get_tokens() > other.get_tokens()
+        return self._key > other._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
 
 
 class Platform:
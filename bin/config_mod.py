@@ -4,10 +4,11 @@ Python configuration module (uses "config_mod.yaml")
 
 Supports BSON, multi-JSON, XML, multi-YAML files.
 
-Copyright GPL v2: 2017-2025 By Dr Colin Kong
+Copyright GPL v2: 2017-2026 By Dr Colin Kong
 """
 
 import json
+import marshal
 import os
 import re
 import sys
@@ -15,15 +16,17 @@ import xml
 import xml.dom.minidom
 import xml.parsers.expat
 from pathlib import Path
-from typing import Any, Generator, List, Tuple, Union
+from typing import Any, Generator, Iterable, List, TextIO, Tuple, Union
 
 import bson  # type: ignore
 import dicttoxml  # type: ignore
 import xmltodict  # type: ignore
 import yaml  # type: ignore
 
-RELEASE = '2.5.1'
-VERSION = 20250426
+RELEASE = '2.7.1'
+VERSION = 20261019
+
+CHUNK_SIZE = 1048576
 
 
 class Data:
@@ -41,6 +44,7 @@ class Data:
         '.yaml': 'YAML',
         '.yml': 'YAML',
     }
+    YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
     def __init__(self, file: Union[str, Path] = None) -> None:
         self._blocks: List[dict] = [{}]
@@ -121,7 +125,8 @@ class Data:
             data = cls._unjinja(data)
         try:
             blocks = [
-                yaml.safe_load(block) for block in cls._split_yamls(data)
+                yaml.load(block, Loader=cls.YAML_LOADER)
+                for block in cls._split_yamls(data)
             ]
         except (
                 yaml.parser.ParserError,
@@ -249,6 +254,81 @@ class Data:
             self._blocks = blocks
         return warnings
 
+    @staticmethod
+    def _iread_json(ifile: TextIO) -> Generator[Any, None, None]:
+        """
+        Yield JSON blocks decoded from sliding buffer.
+        """
+        decoder = json.JSONDecoder()
+        whitespace = re.compile(r'\s*')
+        buffer = ''
+        size = CHUNK_SIZE
+        while True:
+            chunk = ifile.read(size)
+            buffer += chunk
+            index = whitespace.match(buffer).end()
+            while index < len(buffer):
+                try:
+                    block, end = decoder.raw_decode(buffer, index)
+                except json.decoder.JSONDecodeError as exception:
+                    if not chunk:
+                        raise ReadConfigError(exception) from exception
+                    size = max(size, len(buffer) - index)  # Large block
+                    break
+                if chunk and end == len(buffer):  # Maybe truncated
+                    break
+                yield block
+                index = whitespace.match(buffer, end).end()
+                size = CHUNK_SIZE
+            if not chunk:
+                return
+            buffer = buffer[index:]
+
+    @classmethod
+    def _iread_yaml(cls, ifile: TextIO) -> Generator[Any, None, None]:
+        """
+        Yield YAML blocks split at lines starting with "--".
+        """
+        lines: List[str] = []
+        for line in ifile:
+            if line.startswith('--') and lines:
+                yield from cls._decode_yaml(''.join(lines).rstrip('\r\n'))
+                lines = []
+                if line.strip().strip('-'):
+                    lines.append(line[2:])
+            else:
+                lines.append(line)
+        yield from cls._decode_yaml(''.join(lines))
+
+    def iread(
+        self,
+        file: Union[str, Path],
+        config: str = None,
+    ) -> Generator[Any, None, None]:
+        """
+        Yield de-serialized data blocks from configuration file.
+        (JSON and YAML are decoded incrementally)
+        """
+        path = Path(file)
+        if not config:
+            config = self.TYPES.get(path.suffix)
+        if not config:
+            raise ReadConfigError(f'Cannot handle reading "{path}" file.')
+
+        try:
+            if config == 'JSON':
+                with path.open(errors='replace', newline='') as ifile:
+                    yield from self._iread_json(ifile)
+            elif config == 'YAML':
+                with path.open(errors='replace', newline='') as ifile:
+                    yield from self._iread_yaml(ifile)
+            else:
+                yield from self.decode(config, path.read_bytes())
+        except OSError as exception:
+            raise ReadConfigError(
+                f'Cannot read "{path}" {config} file.',
+            ) from exception
+
     @staticmethod
     def _encode_json(blocks: List[dict], compact: bool) -> bytes:
         indent = None if compact else 4
@@ -338,6 +418,62 @@ class Data:
             raise ConfigError(f'Cannot handle encoding "{config}" data.')
         return data
 
+    def iencode(
+        self,
+        config: str,
+        blocks: Iterable[Any],
+        compact: bool = False,
+    ) -> Generator[bytes, None, None]:
+        """
+        Yield encoded data for each data block.
+        (JSON and YAML are encoded incrementally)
+        """
+        if config == 'JSON':
+            separator = b''
+            for block in blocks:
+                yield separator + self._encode_json([block], compact)
+                separator = b'\n'
+        elif config == 'YAML':
+            separator = b''
+            for block in blocks:
+                yield separator + self._encode_yaml([block])
+                separator = b'--\n'
+        else:
+            yield self.encode(config, list(blocks), compact)
+
+    def iwrite(
+        self,
+        file: Union[str, Path],
+        blocks: Iterable[Any],
+        compact: bool = False,
+        config: str = None,
+    ) -> None:
+        """
+        Write configuration file from data blocks iterable.
+        """
+        path = Path(file)
+        tmp_path = Path(f'{path}.part{os.getpid()}')
+
+        if not config:
+            config = self.TYPES.get(path.suffix)
+        if not config:
+            raise WriteConfigError(f'Cannot handle writing "{path}" file.')
+
+        try:
+            with tmp_path.open('wb') as ofile:
+                for data in self.iencode(config, blocks, compact):
+                    ofile.write(data)
+        except OSError as exception:
+            tmp_path.unlink(missing_ok=True)
+            raise WriteConfigError(
+                f'Cannot create "{tmp_path}" {config} file.',
+            ) from exception
+        except ConfigError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        tmp_path.replace(path)
+
     def write(
         self,
         file: Union[str, Path],
@@ -370,12 +506,46 @@ class Config:
     """
     This class deals with "config_mod.yaml" configuration file.
     """
+    _mappings: dict = None
+
     def __init__(self) -> None:
+        if Config._mappings is None:
+            Config._mappings = self._load()
+        self._apps = self._mappings.get('apps', {})
+        self._bindings = self._mappings.get('bindings', {})
+        self._parameters = self._mappings.get('parameters', {})
+
+    @staticmethod
+    def _load() -> dict:
+        """
+        Load configuration using "config_mod.dict" compiled cache.
+        """
         path = Path(__file__).with_name('config_mod.yaml')
+        path_cache = path.with_suffix('.dict')
+        try:
+            file_stat = path.stat()
+            key = (file_stat.st_mtime_ns, file_stat.st_size)
+        except OSError:
+            key = None
+        if key:
+            try:
+                with path_cache.open('rb') as ifile:
+                    if marshal.load(ifile) == key:
+                        return marshal.load(ifile)
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
         mappings = next(Data(path).get())
-        self._apps = mappings.get('apps', {})
-        self._bindings = mappings.get('bindings', {})
-        self._parameters = mappings.get('parameters', {})
+        if key:
+            tmp_path = Path(f'{path_cache}.part{os.getpid()}')
+            try:
+                with tmp_path.open('wb') as ofile:
+                    marshal.dump(key, ofile)
+                    marshal.dump(mappings, ofile)
+                tmp_path.replace(path_cache)
+            except (OSError, ValueError):
+                tmp_path.unlink(missing_ok=True)
+        return mappings
 
     def get(self, parameter: str) -> str:
         """
@@ -397,7 +567,7 @@ class Config:
                 f'Undefined "{app_name.lower()}" app in configuration.'
             )
 
-        command = app['command']
+        command = list(app['command'])
         if view and 'view_flag' in app:
             command.append(app['view_flag'])
         daemon = app.get('daemon') is True
@@ -24,13 +24,16 @@ find /var/lib/registry/docker/registry/v2/repositories \
 """
 
 import argparse
+import concurrent.futures
 import fnmatch
 import json
 import os
 import signal
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Generator, List, Tuple
 
 import requests  # type: ignore
 
@@ -42,7 +45,11 @@ MAXREPO = "99999"
 
 requests.packages.urllib3.disable_warnings()  # pylint: disable=no-member
 
+CACHE_DAYS = 90
+MANIFEST_V1 = 'application/vnd.docker.distribution.manifest.v1+json'
+MANIFEST_V2 = 'application/vnd.docker.distribution.manifest.v2+json'
 SSL_VERIFY = False
+THREADS = 8
 
 
 class Options:
@@ -117,7 +124,15 @@ class DockerRegistry:
     def __init__(self, server: str) -> None:
         self._server = server
         config = Config()
-        self._user_agent = config.get('web_agent')
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=THREADS * 2)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers['User-Agent'] = config.get('web_agent')
+        self._session.verify = SSL_VERIFY
+        self._lock = threading.Lock()
+        self._cache: dict = {}
+        self._cache_path: Path = None
         self._config()
 
     def get_url(self) -> str:
@@ -133,12 +148,41 @@ class DockerRegistry:
         return self._repositories
 
     def _get_url(self, url: str) -> requests.Response:
-        return requests.get(
-            url,
-            headers={'User-Agent': self._user_agent},
-            verify=SSL_VERIFY,
-            timeout=10,
-        )
+        return self._session.get(url, timeout=10)
+
+    def read_cache(self) -> None:
+        """
+        Read manifest digest cache.
+        """
+        try:
+            path = Path(Path.home(), '.cache', 'dockerreg')
+            path.mkdir(parents=True, exist_ok=True)
+            self._cache_path = Path(path, 'digests.json')
+            self._cache = json.loads(
+                self._cache_path.read_text(errors='replace'),
+            )
+        except (OSError, ValueError):
+            self._cache = {}
+
+    def write_cache(self) -> None:
+        """
+        Write manifest digest cache (drop entries unused for CACHE_DAYS).
+        """
+        if not self._cache_path:
+            return
+        expire = time.time() - CACHE_DAYS * 86400
+        with self._lock:
+            cache = {
+                digest: value
+                for digest, value in self._cache.items()
+                if value.get('used', 0) > expire
+            }
+        path_tmp = Path(f'{self._cache_path}.part-{os.getpid()}')
+        try:
+            path_tmp.write_text(json.dumps(cache, indent=1))
+            path_tmp.replace(self._cache_path)
+        except OSError:
+            path_tmp.unlink(missing_ok=True)
 
     def _config(self) -> None:
         self._url = self._server + '/v1/search'
@@ -191,12 +235,7 @@ class DockerRegistry:
 
     def _delete_url(self, url: str) -> None:
         try:
-            response = requests.delete(
-                url,
-                headers={'User-Agent': self._user_agent},
-                verify=SSL_VERIFY,
-                timeout=10,
-            )
+            response = self._session.delete(url, timeout=10)
         except Exception as exception:
             raise SystemExit(str(exception)) from exception
         # v2 returns 202, shared tags can 404
@@ -224,11 +263,18 @@ class DockerRegistry2(DockerRegistry):
     Docker Registry v2 class
     """
 
+    def __init__(self, server: str) -> None:
+        super().__init__(server)
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=THREADS,
+        )
+
     def _get_url(self, url: str) -> requests.Response:
-        return requests.get(url, headers={
-            'User-Agent': self._user_agent,
-            'Accept': 'application/vnd.docker.distribution.manifest.v2+json',
-        }, verify=SSL_VERIFY, timeout=10)
+        return self._session.get(
+            url,
+            headers={'Accept': MANIFEST_V2},
+            timeout=10,
+        )
 
     def _config(self) -> None:
         self._url = f'{self._server}/v2/_catalog?n={MAXREPO}'
@@ -249,10 +295,11 @@ class DockerRegistry2(DockerRegistry):
         Return image creation time stamp (uses v1Compatibility mode).
         """
         url = f'{self._server}/v2/{repository}/manifests/{tag}'
-        response = requests.get(url, headers={
-            'User-Agent': self._user_agent,
-            'Accept': 'application/vnd.docker.distribution.manifest.v1+json',
-        }, verify=SSL_VERIFY, timeout=10)
+        response = self._session.get(
+            url,
+            headers={'Accept': MANIFEST_V1},
+            timeout=10,
+        )
 
         try:
             last_layer = response.json()['history'][0]['v1Compatibility']
@@ -281,30 +328,58 @@ class DockerRegistry2(DockerRegistry):
 
         tags = response.json()['tags']
         if tags:
-            for tag in [x for x in tags if fnmatch.fnmatch(x, tag_match)]:
-                url = f'{self._server}/v2/{repository}/manifests/{tag}'
-                try:
-                    response = self._get_url(url)
-                except Exception as exception:
-                    raise SystemExit(str(exception)) from exception
-                if response.status_code != 200:
-                    if response.status_code == 404:
-                        print(f"WARNING 404: {url}", file=sys.stderr)
-                        continue
-                    raise SystemExit(
-                        f'Requests "{url}" response code: '
-                        f'{response.status_code}',
-                    )
-                data = response.json()
-                info[tag] = {
-                    'digest': response.headers['docker-content-digest'],
-                    'image_id': data['config']['digest'],
-                    'timestamp': self.get_time(repository, tag),
-                    'size': sum(x['size'] for x in data['layers']),
-                }
+            tags = [x for x in tags if fnmatch.fnmatch(x, tag_match)]
+            for tag, tag_info in zip(tags, self._pool.map(
+                lambda x: self._get_tag_info(repository, x),
+                tags,
+            )):
+                if tag_info:
+                    info[tag] = tag_info
 
         return info
 
+    def _get_tag_info(self, repository: str, tag: str) -> dict:
+        """
+        Return tag information (cached by manifest digest).
+        """
+        url = f'{self._server}/v2/{repository}/manifests/{tag}'
+        try:
+            response = self._session.head(
+                url,
+                headers={'Accept': MANIFEST_V2},
+                timeout=10,
+            )
+        except Exception as exception:
+            raise SystemExit(str(exception)) from exception
+        digest = response.headers.get('docker-content-digest')
+        with self._lock:
+            if response.status_code == 200 and digest in self._cache:
+                self._cache[digest]['used'] = int(time.time())
+                return {'digest': digest, **self._cache[digest]}
+
+        try:
+            response = self._get_url(url)
+        except Exception as exception:
+            raise SystemExit(str(exception)) from exception
+        if response.status_code != 200:
+            if response.status_code == 404:
+                print(f"WARNING 404: {url}", file=sys.stderr)
+                return None
+            raise SystemExit(
+                f'Requests "{url}" response code: '
+                f'{response.status_code}',
+            )
+        data = response.json()
+        digest = response.headers['docker-content-digest']
+        info = {
+            'image_id': data['config']['digest'],
+            'timestamp': self.get_time(repository, tag),
+            'size': sum(x['size'] for x in data['layers']),
+        }
+        with self._lock:
+            self._cache[digest] = {**info, 'used': int(time.time())}
+        return {'digest': digest, **info}
+
     def delete(
         self,
         server: str,
@@ -379,35 +454,59 @@ class Main:
 
         return server, repo_match, tag_match
 
+    @staticmethod
+    def _get_infos(
+        registry: DockerRegistry,
+        repo_match: str,
+        tag_match: str,
+    ) -> Generator[Tuple[str, dict], None, None]:
+        """
+        Yield repository information in order (fetched concurrently).
+        """
+        repositories = [
+            x
+            for x in sorted(registry.get_repositories())
+            if fnmatch.fnmatch(x, repo_match)
+        ]
+        with concurrent.futures.ThreadPoolExecutor(THREADS) as pool:
+            yield from zip(repositories, pool.map(
+                lambda x: registry.get_info(x, tag_match),
+                repositories,
+            ))
+
     @classmethod
     def _check(cls, url: str, remove: bool = False) -> None:
         server, repo_match, tag_match = cls._breakup_url(url)
         registry = cls._get_registry(server)
+        registry.read_cache()
         prefix = server.rsplit('://', 1)[-1]
 
-        for repository in sorted(registry.get_repositories()):
-            if fnmatch.fnmatch(repository, repo_match):
-                info = registry.get_info(repository, tag_match)
-                for tag in sorted(info):
-                    image_id = info[tag]['image_id'].split(':', 1)[-1][:12]
-                    timestamp = info[tag]['timestamp']
-                    size = info[tag]['size'] / 1048576
-                    image = f'{prefix}/{repository}:{tag}'
-                    if remove:
-                        print(
-                            f"{image_id}  "
-                            f"{timestamp} "
-                            f"{size:8.2f}  "
-                            f"{image}  DELETE",
-                        )
-                        registry.delete(
-                            server,
-                            repository,
-                            tag,
-                            info[tag]['digest'],
-                        )
-                    else:
-                        print(f"{image_id}  {timestamp} {size:8.2f}  {image}")
+        for repository, info in cls._get_infos(
+            registry,
+            repo_match,
+            tag_match,
+        ):
+            for tag in sorted(info):
+                image_id = info[tag]['image_id'].split(':', 1)[-1][:12]
+                timestamp = info[tag]['timestamp']
+                size = info[tag]['size'] / 1048576
+                image = f'{prefix}/{repository}:{tag}'
+                if remove:
+                    print(
+                        f"{image_id}  "
+                        f"{timestamp} "
+                        f"{size:8.2f}  "
+                        f"{image}  DELETE",
+                    )
+                    registry.delete(
+                        server,
+                        repository,
+                        tag,
+                        info[tag]['digest'],
+                    )
+                else:
+                    print(f"{image_id}  {timestamp} {size:8.2f}  {image}")
+        registry.write_cache()
 
     @classmethod
     def run(cls) -> int:
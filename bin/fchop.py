@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
 """
-Chop up a file into chunks.
+Chop up a file into chunks or join chunks back into a file.
 """
 
 import argparse
+import concurrent.futures
+import hashlib
 import os
 import signal
 import sys
 from pathlib import Path
-from typing import BinaryIO, List
+from typing import List, Tuple
+
+from file_mod import FileUtil
 
 
 class Options:
@@ -20,45 +24,96 @@ class Options:
         self._args: argparse.Namespace = None
         self.parse(sys.argv)
 
+    def get_checksum(self) -> str:
+        """
+        Return SHA256 checksum to verify.
+        """
+        return self._args.sha256[0].lower() if self._args.sha256 else None
+
     def get_file(self) -> str:
         """
         Return file.
         """
         return os.path.expandvars(self._args.file[0])
 
+    def get_join_flag(self) -> bool:
+        """
+        Return join flag.
+        """
+        return self._args.join_flag
+
     def get_max_size(self) -> int:
         """
         Return max size of file part.
         """
         return self._max_size
 
+    def get_threads(self) -> int:
+        """
+        Return number of threads.
+        """
+        return self._args.threads[0]
+
     def _parse_args(self, args: List[str]) -> None:
         parser = argparse.ArgumentParser(
-            description="Chop up a file into chunks.",
+            description="Chop up a file into chunks or join chunks back "
+            "into a file.",
         )
 
+        parser.add_argument(
+            '-join',
+            dest='join_flag',
+            action='store_true',
+            help='Join "file.001", "file.002"... chunks into file.',
+        )
+        parser.add_argument(
+            '-sha256',
+            nargs=1,
+            metavar='checksum',
+            help="Verify SHA256 checksum of file.",
+        )
+        parser.add_argument(
+            '-threads',
+            nargs=1,
+            type=int,
+            default=[1],
+            help="Number of chunks to copy in parallel. Default is 1.",
+        )
         parser.add_argument(
             'file',
             nargs=1,
-            help="File to break up.",
+            help="File to break up or join.",
         )
         parser.add_argument(
             'size',
-            nargs=1,
+            nargs='?',
             metavar='bytes',
             help="Maximum chunk size in bytes or MB.",
         )
 
         self._args = parser.parse_args(args)
 
+        if self._args.threads[0] < 1:
+            raise SystemExit(
+                f'{sys.argv[0]}: You must specific a positive integer '
+                'for threads.',
+            )
+
     def parse(self, args: List[str]) -> None:
         """
         Parse arguments
         """
         self._parse_args(args[1:])
 
+        self._max_size = 0
+        if self._args.join_flag:
+            return
+        if self._args.size is None:
+            raise SystemExit(
+                f'{sys.argv[0]}: You must specific an integer for chunksize.',
+            )
         try:
-            size = self._args.size[0]
+            size = self._args.size
             self._max_size = (
                 int(size[:-2]) * 1024**2 if size.endswith('MB') else int(size)
             )
@@ -101,42 +156,138 @@ class Main:
                 return open(str(file), *args, **kwargs)
             Path.open = _open  # type: ignore
 
-    def _copy(self, ifile: BinaryIO, ofile: BinaryIO) -> None:
-        chunks, lchunk = divmod(self._max_size, self._cache_size)
-        for i in [self._cache_size]*chunks + [lchunk]:
-            chunk = ifile.read(i)
-            if not chunk:
-                break
-            ofile.write(chunk)
-
-    def run(self) -> int:
+    @staticmethod
+    def _copy(job: Tuple[Path, Path, int, int, int]) -> None:
         """
-        Start program
+        Copy range from source file to target file offset.
         """
-        options = Options()
-        self._cache_size = 131072
-        self._max_size = options.get_max_size()
+        path1, path2, offset, size, out_offset = job
+        try:
+            with path1.open('rb') as ifile:
+                with path2.open('r+b') as ofile:
+                    FileUtil.copy_range(
+                        ifile.fileno(),
+                        ofile.fileno(),
+                        offset,
+                        size,
+                        out_offset,
+                    )
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot copy "{path1}" to "{path2}" file.',
+            ) from exception
 
-        path = Path(options.get_file())
+    def _run_jobs(self, jobs: List[Tuple[Path, Path, int, int, int]]) -> None:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._threads,
+        ) as executor:
+            for _ in executor.map(self._copy, jobs):
+                pass
+
+    @staticmethod
+    def _sha256sum(path: Path) -> str:
         try:
             with path.open('rb') as ifile:
-                for part in range(int(
-                    path.stat().st_size / options.get_max_size() + 1
-                )):
-                    try:
-                        file = f'{path}.{str(part + 1).zfill(3)}'
-                        with Path(file).open('wb') as ofile:
-                            print(f"{file}...")
-                            self._copy(ifile, ofile)
-                    except OSError as exception:
-                        raise SystemExit(
-                            f'{sys.argv[0]}: Cannot create '
-                            f'"{str(part + 1).zfill(3)}" file.',
-                        ) from exception
+                sha256 = hashlib.sha256()
+                while True:
+                    chunk = ifile.read(131072)
+                    if not chunk:
+                        break
+                    sha256.update(chunk)
         except OSError as exception:
             raise SystemExit(
                 f'{sys.argv[0]}: Cannot read "{path}" file.',
             ) from exception
+        return sha256.hexdigest()
+
+    def _check(self, path: Path, checksum: str) -> None:
+        if checksum:
+            print(f"{path}: Verifying SHA256 checksum...")
+            if self._sha256sum(path) != checksum:
+                raise SystemExit(
+                    f'{sys.argv[0]}: Checksum mismatch for "{path}" file.',
+                )
+
+    def _split(self, path: Path, max_size: int) -> None:
+        try:
+            size = path.stat().st_size
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot read "{path}" file.',
+            ) from exception
+
+        jobs = []
+        for part in range(int(size / max_size + 1)):
+            file = f'{path}.{str(part + 1).zfill(3)}'
+            print(f"{file}...")
+            try:
+                with Path(file).open('wb'):
+                    pass
+            except OSError as exception:
+                raise SystemExit(
+                    f'{sys.argv[0]}: Cannot create '
+                    f'"{str(part + 1).zfill(3)}" file.',
+                ) from exception
+            offset = part * max_size
+            jobs.append((
+                path,
+                Path(file),
+                offset,
+                max(0, min(max_size, size - offset)),
+                0,
+            ))
+        self._run_jobs(jobs)
+
+    def _join(self, path: Path, checksum: str) -> None:
+        paths: List[Path] = []
+        while True:
+            path_part = Path(f'{path}.{str(len(paths) + 1).zfill(3)}')
+            if not path_part.is_file():
+                break
+            paths.append(path_part)
+        if not paths:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot find "{path}.001" file.',
+            )
+
+        print(f"{path}...")
+        path_tmp = Path(f'{path}.part')
+        jobs = []
+        offset = 0
+        try:
+            with path_tmp.open('wb') as ofile:
+                for path_part in paths:
+                    size = path_part.stat().st_size
+                    jobs.append((path_part, path_tmp, 0, size, offset))
+                    offset += size
+                ofile.truncate(offset)
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot create "{path_tmp}" file.',
+            ) from exception
+        self._run_jobs(jobs)
+        self._check(path_tmp, checksum)
+
+        try:
+            path_tmp.replace(path)
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot create "{path}" file.',
+            ) from exception
+
+    def run(self) -> int:
+        """
+        Start program
+        """
+        options = Options()
+        self._threads = options.get_threads()
+
+        path = Path(options.get_file())
+        if options.get_join_flag():
+            self._join(path, options.get_checksum())
+        else:
+            self._check(path, options.get_checksum())
+            self._split(path, options.get_max_size())
 
         return 0
 
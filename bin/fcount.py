@@ -4,11 +4,18 @@ Count number of lines and maximum columns used in file.
 """
 
 import argparse
+import codecs
+import concurrent.futures
+import locale
+import mmap
 import os
+import re
 import signal
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
+
+WINDOW_SIZE = 67108864
 
 
 class Options:
@@ -77,31 +84,139 @@ class Main:
             Path.open = _open  # type: ignore
 
     @staticmethod
-    def run() -> int:
+    def _count_text(path: Path) -> Tuple[int, int, int]:
+        nlines = 0
+        maxcols = 0
+        lline = 0
+        with path.open(errors='replace') as ifile:
+            for line in ifile:
+                nlines += 1
+                ncols = len(line.rstrip('\n'))
+                if ncols > maxcols:
+                    maxcols = ncols
+                    lline = nlines
+        return nlines, maxcols, lline
+
+    @staticmethod
+    def _count_window(window: bytes) -> Tuple[int, int, int]:
+        """
+        Return (lines, max columns, line with max columns) for window.
+
+        Only lines with more bytes than the current maximum are decoded.
+        """
+        maxcols = 0
+        lline = 0
+        start = 0
+        counted = (0, 0)
+        while True:
+            end = window.find(b'\n', start)
+            if end == -1:
+                end = len(window)
+            ncols = len(window[start:end].decode(errors='replace'))
+            if ncols > maxcols:
+                maxcols = ncols
+                counted = (
+                    start,
+                    counted[1] + window.count(b'\n', counted[0], start),
+                )
+                lline = counted[1] + 1
+            match = re.compile(rb'\n[^\n]{%d}' % (maxcols + 1)).search(
+                window,
+                end,
+            )
+            if not match:
+                break
+            start = match.start() + 1
+
+        nlines = window.count(b'\n')
+        if not window.endswith(b'\n'):
+            nlines += 1
+        return nlines, maxcols, lline
+
+    @classmethod
+    def _count_range(cls, job: Tuple[Path, int, int]) -> Tuple[int, int, int]:
+        path, start, end = job
+        try:
+            if end < 0:
+                return cls._count_text(path)
+            with path.open('rb') as ifile:
+                with mmap.mmap(
+                    ifile.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ,
+                ) as data:
+                    return cls._count_window(data[start:end])
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot read "{path}" file.',
+            ) from exception
+
+    @staticmethod
+    def _get_ranges(path: Path) -> List[Tuple[Path, int, int]]:
+        """
+        Return newline aligned ranges (end of -1 means decode as text).
+        """
+        encoding = locale.getpreferredencoding(False)
+        if codecs.lookup(encoding).name != 'utf-8':
+            return [(path, 0, -1)]
+
+        ranges = []
+        try:
+            with path.open('rb') as ifile:
+                size = os.fstat(ifile.fileno()).st_size
+                if size == 0:
+                    return []
+                with mmap.mmap(
+                    ifile.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ,
+                ) as data:
+                    if data.find(b'\r') != -1:  # Universal newlines
+                        return [(path, 0, -1)]
+                    start = 0
+                    while start < size:
+                        end = min(start + WINDOW_SIZE, size)
+                        if end < size:
+                            newline = data.rfind(b'\n', start, end)
+                            if newline == -1:
+                                newline = data.find(b'\n', end)
+                            end = size if newline == -1 else newline + 1
+                        ranges.append((path, start, end))
+                        start = end
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot read "{path}" file.',
+            ) from exception
+        return ranges
+
+    @classmethod
+    def run(cls) -> int:
         """
         Start program
         """
         options = Options()
 
-        lline = 0
-        for path in [Path(x) for x in options.get_files()]:
-            if path.is_file():
+        paths = [Path(x) for x in options.get_files()]
+        paths = [x for x in paths if x.is_file()]
+        ranges = {x: cls._get_ranges(x) for x in paths}
+        jobs = [job for x in paths for job in ranges[x]]
+
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            results = (
+                executor.map(cls._count_range, jobs)
+                if len(jobs) > 1
+                else map(cls._count_range, jobs)
+            )
+            lline = 0
+            for path in paths:
                 nlines = 0
                 maxcols = 0
-                try:
-                    with path.open(errors='replace') as ifile:
-                        for line in ifile:
-                            nlines += 1
-                            ncols = len(line.rstrip('\n'))
-                            if ncols > maxcols:
-                                maxcols = ncols
-                                lline = nlines
-                except OSError as exception:
-                    raise SystemExit(
-                        f'{sys.argv[0]}: Cannot read "{path}" file.',
-                    ) from exception
-                except UnicodeDecodeError:  # Non text file
-                    continue
+                for _ in ranges[path]:
+                    lines, ncols, line = next(results)
+                    if ncols > maxcols:
+                        maxcols = ncols
+                        lline = nlines + line
+                    nlines += lines
                 print(
                     f"{path}: {nlines} lines (max length of {maxcols} "
                     f"on line {lline})",
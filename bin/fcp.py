@@ -4,13 +4,14 @@ Copy files and directories.
 """
 
 import argparse
+import concurrent.futures
 import os
 import shutil
 import signal
 import sys
 import time
 from pathlib import Path
-from typing import Any, List
+from typing import Any, List, Tuple
 
 from file_mod import FileStat, FileUtil
 
@@ -36,11 +37,25 @@ class Options:
         """
         return Path(self._target)
 
+    def get_threads(self) -> int:
+        """
+        Return number of threads.
+        """
+        return self._args.threads[0]
+
     def _parse_args(self, args: List[str]) -> None:
         parser = argparse.ArgumentParser(
             description="Copy files and directories.",
         )
 
+        parser.add_argument(
+            '-threads',
+            nargs=1,
+            type=int,
+            default=[min(8, os.cpu_count() or 1)],
+            help="Number of files to copy in parallel. Default is number "
+            "of CPU cores (maximum 8).",
+        )
         parser.add_argument(
             'sources',
             nargs='+',
@@ -56,6 +71,12 @@ class Options:
 
         self._args = parser.parse_args(args)
 
+        if self._args.threads[0] < 1:
+            raise SystemExit(
+                f'{sys.argv[0]}: You must specific a positive integer '
+                'for threads.',
+            )
+
     def parse(self, args: List[str]) -> None:
         """
         Parse arguments
@@ -166,6 +187,10 @@ class Main:
                 ) from exception
         for path in paths:
             self._copy(path, Path(path2, path.name))
+        self._directories.append((path1, path2))
+
+    @staticmethod
+    def _set_directory_time(path1: Path, path2: Path) -> None:
         newest = FileUtil.newest(list(path2.iterdir()))
         if not newest:
             newest = str(path1)
@@ -173,7 +198,23 @@ class Main:
         os.utime(path2, (file_time, file_time))
 
     @staticmethod
-    def _copy_file(path1: Path, path2: Path) -> None:
+    def _copy_data(path1: Path, path2: Path) -> None:
+        """
+        Copy using reflink, then kernel copy and then buffered copy.
+        """
+        with path1.open('rb') as ifile:
+            with path2.open('wb') as ofile:
+                if not FileUtil.clone(ifile.fileno(), ofile.fileno()):
+                    FileUtil.copy_range(
+                        ifile.fileno(),
+                        ofile.fileno(),
+                        0,
+                        os.fstat(ifile.fileno()).st_size,
+                        0,
+                    )
+        shutil.copystat(path1, path2)
+
+    def _copy_file(self, path1: Path, path2: Path) -> None:
         if path2.exists():
             stat1 = path1.stat()
             stat2 = path2.stat()
@@ -184,13 +225,23 @@ class Main:
                 return
 
         print(f'Creating "{path2}" file...')
+        self._nfiles += 1
+        self._size += path1.stat().st_size
+        if self._executor:
+            self._futures.append(
+                self._executor.submit(self._write_file, path1, path2),
+            )
+        else:
+            self._write_file(path1, path2)
+
+    def _write_file(self, path1: Path, path2: Path) -> None:
         path_tmp = Path(f'{path2}.part')
         try:
-            shutil.copy2(path1, path_tmp)
+            self._copy_data(path1, path_tmp)
             if os.getuid() == 0:
                 stat = path_tmp.parent.stat()
                 os.chown(path_tmp, stat.st_uid, stat.st_gid)
-        except (FileNotFoundError, PermissionError, shutil.Error) as exception:
+        except OSError as exception:
             raise SystemExit(
                 f'{sys.argv[0]}: Cannot create "{path_tmp}" file.',
             ) from exception
@@ -212,20 +263,11 @@ class Main:
         elif path1.is_file():
             self._copy_file(path1, path2)
 
-    def run(self) -> int:
-        """
-        Start program
-        """
-        self._options = Options()
-
-        sources = self._options.get_sources()
-        target = self._options.get_target()
-        self._automount(target, 8)
-
+    def _copy_sources(self, sources: List[Path], target: Path) -> None:
         if len(sources) == 1:
             if not target.is_dir() and sources[0].is_file():
                 self._copy_file(sources[0], target)
-                return 0
+                return
         elif not target.is_dir():
             raise SystemExit(
                 f'{sys.argv[0]}: Cannot find "{target}" target directory.',
@@ -258,6 +300,45 @@ class Main:
             else:
                 self._copy(source, Path(target, source.name))
 
+    def run(self) -> int:
+        """
+        Start program
+        """
+        self._options = Options()
+
+        sources = self._options.get_sources()
+        target = self._options.get_target()
+        self._automount(target, 8)
+
+        self._directories: List[Tuple[Path, Path]] = []
+        self._futures: List[concurrent.futures.Future] = []
+        self._nfiles = 0
+        self._size = 0
+        start_time = time.time()
+        threads = self._options.get_threads()
+        self._executor = None
+        if threads > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=threads,
+            )
+        try:
+            self._copy_sources(sources, target)
+        finally:
+            for future in self._futures:
+                future.result()
+            if self._executor:
+                self._executor.shutdown()
+        for path1, path2 in self._directories:
+            self._set_directory_time(path1, path2)
+
+        if self._nfiles:
+            elapsed_time = max(time.time() - start_time, 0.001)
+            print(
+                f"{self._nfiles} files, {self._size / 1048576:.0f} MB, "
+                f"{elapsed_time:4.2f} seconds, "
+                f"{self._size / 1048576 / elapsed_time:.0f} MB/s",
+            )
+
         return 0
 
 
@@ -4,12 +4,20 @@ Copy a file to multiple target files.
 """
 
 import argparse
+import concurrent.futures
+import hashlib
 import os
+import queue
 import shutil
 import signal
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+CHUNK_SIZE = 1048576
+RING_SIZE = 16
 
 
 class Options:
@@ -33,11 +41,23 @@ class Options:
         """
         return [os.path.expandvars(x) for x in self._args.targets]
 
+    def get_verify_flag(self) -> bool:
+        """
+        Return verify flag.
+        """
+        return self._args.verify_flag
+
     def _parse_args(self, args: List[str]) -> None:
         parser = argparse.ArgumentParser(
             description="Copy a file to multiple target files.",
         )
 
+        parser.add_argument(
+            '-verify',
+            dest='verify_flag',
+            action='store_true',
+            help="Verify SHA256 checksum of target files.",
+        )
         parser.add_argument(
             'source',
             nargs=1,
@@ -64,6 +84,93 @@ class Options:
         self._parse_args(args[1:])
 
 
+class WriterThread(threading.Thread):
+    """
+    Writer thread class (writes chunks from ring buffer queue)
+    """
+
+    def __init__(self, path1: Path, path2: Path) -> None:
+        threading.Thread.__init__(self, daemon=True)
+        self._path1 = path1
+        self._path2 = path2
+        self._queue: queue.Queue = queue.Queue(maxsize=RING_SIZE)
+        self._error = ''
+        self._eof = False
+        self._size = 0
+        self._elapsed = 0.
+
+    def get_error(self) -> str:
+        """
+        Return error message.
+        """
+        return self._error
+
+    def get_path(self) -> Path:
+        """
+        Return target path.
+        """
+        return self._path2
+
+    def get_rate(self) -> str:
+        """
+        Return throughput report.
+        """
+        elapsed = max(self._elapsed, 0.001)
+        return (
+            f"{self._size / 1048576:.0f} MB, {elapsed:4.2f} seconds, "
+            f"{self._size / 1048576 / elapsed:.0f} MB/s"
+        )
+
+    def put(self, chunk: Optional[bytes]) -> None:
+        """
+        Queue chunk (empty chunk ends file and None aborts).
+        """
+        self._queue.put(chunk)
+
+    def _write(self, path_tmp: Path) -> bool:
+        with path_tmp.open('wb') as ofile:
+            while True:
+                chunk = self._queue.get()
+                if not chunk:
+                    self._eof = True
+                    if chunk is None:
+                        return False
+                    break
+                ofile.write(chunk)
+                self._size += len(chunk)
+        shutil.copystat(self._path1, path_tmp)
+        return True
+
+    def run(self) -> None:
+        """
+        Run thread
+        """
+        start_time = time.time()
+        path_tmp = Path(f'{self._path2}.part')
+        try:
+            if not self._write(path_tmp):
+                path_tmp.unlink()
+                return
+        except OSError:
+            self._error = f'Cannot create "{path_tmp}" file.'
+            if not self._eof:
+                while self._queue.get():  # Drain so reader never blocks
+                    pass
+            try:
+                path_tmp.unlink()
+            except OSError:
+                pass
+            return
+        try:
+            path_tmp.replace(self._path2)
+        except OSError:
+            try:
+                shutil.move(str(path_tmp), str(self._path2))  # < 3.9
+            except OSError:
+                self._error = f'Cannot create "{self._path2}" file.'
+        self._elapsed = time.time() - start_time
+
+
 class Main:
     """
     Main class
@@ -93,27 +200,61 @@ class Main:
             Path.open = _open  # type: ignore
 
     @staticmethod
-    def _copy(path1: Path, path2: Path) -> None:
-        if path2.is_dir():
-            print(f'Copying to "{Path(path2, path1.name)}" file...')
-        else:
-            print(f'Copying to "{path2}" file...')
-        path_tmp = Path(f'{path2}.part')
+    def _copy(path1: Path, writers: List[WriterThread]) -> str:
+        """
+        Read source once and fan out chunks to all writers.
+        """
+        sha256 = hashlib.sha256()
+        for writer in writers:
+            writer.start()
         try:
-            shutil.copy2(path1, path_tmp)
-        except shutil.Error as exception:
+            with path1.open('rb') as ifile:
+                while True:
+                    chunk = ifile.read(CHUNK_SIZE)
+                    for writer in writers:
+                        writer.put(chunk)
+                    if not chunk:
+                        break
+                    sha256.update(chunk)
+        except OSError as exception:
+            for writer in writers:
+                writer.put(None)
             raise SystemExit(
-                f'{sys.argv[0]}: Cannot create "{path_tmp}" file.',
+                f'{sys.argv[0]}: Cannot read "{path1}" file.',
             ) from exception
+        for writer in writers:
+            writer.join()
+        return sha256.hexdigest()
+
+    @staticmethod
+    def _sha256sum(path: Path) -> str:
         try:
-            path_tmp.replace(path2)
+            with path.open('rb') as ifile:
+                sha256 = hashlib.sha256()
+                while True:
+                    chunk = ifile.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sha256.update(chunk)
         except OSError:
-            try:
-                shutil.move(str(path_tmp), str(path2))  # < 3.9
-            except OSError as exception:
-                raise SystemExit(
-                    f'{sys.argv[0]}: Cannot create "{path2}" file.',
-                ) from exception
+            return ''
+        return sha256.hexdigest()
+
+    def _verify(self, paths: List[Path], checksum: str) -> int:
+        errors = 0
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(len(paths), 1),
+        ) as executor:
+            for path, sha256sum in zip(
+                paths,
+                executor.map(self._sha256sum, paths),
+            ):
+                if sha256sum != checksum:
+                    print(
+                        f'{sys.argv[0]}: Checksum mismatch for "{path}" file.',
+                    )
+                    errors += 1
+        return errors
 
     def run(self) -> int:
         """
@@ -121,10 +262,29 @@ class Main:
         """
         options = Options()
         source = Path(options.get_source())
+
+        writers = []
         for target in [Path(x) for x in options.get_targets()]:
-            self._copy(source, target)
+            if target.is_dir():
+                target = Path(target, source.name)
+            print(f'Copying to "{target}" file...')
+            writers.append(WriterThread(source, target))
+        checksum = self._copy(source, writers)
+
+        errors = 0
+        for writer in writers:
+            if writer.get_error():
+                print(f'{sys.argv[0]}: {writer.get_error()}')
+                errors += 1
+            else:
+                print(f'"{writer.get_path()}": {writer.get_rate()}')
+        if options.get_verify_flag():
+            errors += self._verify(
+                [x.get_path() for x in writers if not x.get_error()],
+                checksum,
+            )
 
-        return 0
+        return 1 if errors else 0
 
 
 if __name__ == '__main__':
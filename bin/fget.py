@@ -4,12 +4,14 @@ Download http/https/ftp/file URLs.
 """
 
 import argparse
+import concurrent.futures
 import http
 import json
 import os
 import signal
 import socket
 import sys
+import threading
 import time
 import urllib.request
 from pathlib import Path
@@ -19,6 +21,10 @@ from config_mod import Config
 from file_mod import FileStat
 from task_mod import Tasks
 
+FGET_RANGE_MIN = 1048576
+FGET_RETRIES = 3
+FGET_TIMEOUT = 60
+
 
 class Options:
     """
@@ -30,6 +36,18 @@ class Options:
         self._config()
         self.parse(sys.argv)
 
+    def get_jobs(self) -> int:
+        """
+        Return number of concurrent URL downloads.
+        """
+        return self._args.jobs[0]
+
+    def get_split(self) -> int:
+        """
+        Return number of ranged connections per download.
+        """
+        return self._args.split[0]
+
     def get_urls(self) -> List[str]:
         """
         Return list of urls.
@@ -54,6 +72,22 @@ class Options:
             description="Download http/https/ftp/file URLs.",
         )
 
+        parser.add_argument(
+            '-jobs',
+            nargs=1,
+            type=int,
+            default=[4],
+            help="Select number of URLs to download concurrently. "
+            "Default is 4.",
+        )
+        parser.add_argument(
+            '-split',
+            nargs=1,
+            type=int,
+            default=[1],
+            help="Select number of ranged connections per download. "
+            "Default is 1.",
+        )
         parser.add_argument(
             'urls',
             nargs='+',
@@ -70,6 +104,17 @@ class Options:
         """
         self._parse_args(args[1:])
 
+        if self._args.jobs[0] < 1:
+            raise SystemExit(
+                f'{sys.argv[0]}: You must specific a positive integer for '
+                'number of concurrent downloads.',
+            )
+        if self._args.split[0] < 1:
+            raise SystemExit(
+                f'{sys.argv[0]}: You must specific a positive integer for '
+                'number of ranged connections.',
+            )
+
 
 class Main:
     """
@@ -167,8 +212,24 @@ class Main:
         return 'download'
 
     @staticmethod
-    def _write_resume(file: str, data: dict) -> None:
-        json_data = {
+    def _read_ranges(file: str) -> List[List[int]]:
+        """
+        Return completed [start, end] byte ranges of ".part" file.
+        """
+        try:
+            path = Path(f'{file}.part.json')
+            json_data = json.loads(path.read_text(errors='replace'))
+            return sorted(json_data['fget']['ranges'])
+        except (KeyError, OSError, TypeError, ValueError):
+            pass
+        try:
+            return [[0, Path(f'{file}.part').stat().st_size]]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _write_resume(file: str, data: dict, ranges: list = None) -> None:
+        json_data: dict = {
             'fget': {
                 'lock': {
                     'host': socket.gethostname().split('.')[0].lower(),
@@ -177,18 +238,154 @@ class Main:
                 'data': data
             }
         }
+        if ranges is not None:
+            json_data['fget']['ranges'] = ranges
 
+        path_tmp = Path(f'{file}.part.json-{os.getpid()}')
         try:
-            with Path(f'{file}.part.json').open('w') as ofile:
+            with path_tmp.open('w') as ofile:
                 print(json.dumps(
                     json_data,
                     ensure_ascii=False,
                     indent=4,
                     sort_keys=True,
                 ), file=ofile)
+            path_tmp.replace(f'{file}.part.json')
         except OSError:
             pass
 
+    @staticmethod
+    def _get_gaps(size: int, ranges: List[List[int]]) -> List[List[int]]:
+        gaps = []
+        position = 0
+        for start, end in sorted(ranges):
+            if start > position:
+                gaps.append([position, min(start, size)])
+            position = max(position, end)
+        if position < size:
+            gaps.append([position, size])
+        return gaps
+
+    def _fetch_range(
+        self,
+        url: str,
+        fd: int,
+        part: List[int],
+        stop: threading.Event,
+    ) -> None:
+        """
+        Fetch byte range and write at offset in file.
+        """
+        start, end = part
+        req = urllib.request.Request(url, headers={
+            'Range': f'bytes={start}-{end - 1}',
+            'User-Agent': Config().get('web_agent'),
+        })
+        nbytes = 0
+        try:
+            with urllib.request.urlopen(req, timeout=FGET_TIMEOUT) as conn:
+                if conn.status != 206:
+                    raise RangeError('Range request not supported')
+                while start < end:
+                    if stop.is_set() or self._stop.is_set():
+                        raise KeyboardInterrupt
+                    chunk = conn.read(min(self._chunk_size, end - start))
+                    if not chunk:
+                        raise http.client.IncompleteRead(b'', end - start)
+                    os.pwrite(fd, chunk, start)
+                    start += len(chunk)
+                    nbytes += len(chunk)
+                    with self._lock:
+                        self._progress[fd] += len(chunk)
+        except BaseException:
+            with self._lock:  # Range will be fetched again
+                self._progress[fd] -= nbytes
+            raise
+
+    def _fetch_part(
+        self,
+        url: str,
+        fd: int,
+        part: List[int],
+        ranges: List[List[int]],
+        stop: threading.Event,
+    ) -> None:
+        for retry in range(FGET_RETRIES):
+            try:
+                self._fetch_range(url, fd, part, stop)
+                break
+            except (OSError, http.client.HTTPException):
+                if retry + 1 == FGET_RETRIES:
+                    raise
+                time.sleep(2 * (retry + 1))
+        with self._lock:
+            ranges.append(part)
+
+    def _fetch_ranges(
+        self,
+        url: str,
+        file: str,
+        size: int,
+        data: dict,
+    ) -> None:
+        """
+        Fetch ranges concurrently into pre-allocated sparse file.
+        """
+        ranges = self._read_ranges(file)
+        step = max(FGET_RANGE_MIN, -(-size // (self._split * 4)))
+        parts = [
+            [position, min(position + step, end)]
+            for start, end in self._get_gaps(size, ranges)
+            for position in range(start, end, step)
+        ]
+        self._write_resume(file, data, ranges)
+
+        try:
+            fd = os.open(f'{file}.part', os.O_RDWR | os.O_CREAT, 0o666)
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot create "{file}" file.',
+            ) from exception
+        try:
+            os.ftruncate(fd, size)
+            self._progress[fd] = size - sum(x[1] - x[0] for x in parts)
+            pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._split,
+            )
+            stop = threading.Event()
+            futures = [
+                pool.submit(self._fetch_part, url, fd, part, ranges, stop)
+                for part in parts
+            ]
+            try:
+                while futures:
+                    done, _ = concurrent.futures.wait(futures, timeout=1)
+                    for future in done:
+                        futures.remove(future)
+                        future.result()
+                    with self._lock:
+                        self._write_resume(file, data, ranges)
+                        if self._show_progress:
+                            print(
+                                f"\r  => {file} "
+                                f"[{self._progress[fd]}/{size}]",
+                                end='',
+                            )
+            except BaseException:
+                stop.set()
+                raise
+            finally:
+                for future in futures:
+                    future.cancel()
+                pool.shutdown()
+            if self._show_progress:
+                print()
+        finally:
+            os.close(fd)
+            with self._lock:
+                self._write_resume(file, data, ranges)
+                del self._progress[fd]
+
     def _fetch(self, url: str) -> None:
         try:
             # pylint: disable=consider-using-with
@@ -207,8 +404,63 @@ class Main:
 
         if check == 'skip':
             return
-        if 'Accept-Ranges' in conn.info() and check == 'resume':
-            tmpsize = Path(f'{file}.part').stat().st_size
+        if (
+            self._split > 1 and
+            conn.info().get('Accept-Ranges') == 'bytes' and
+            size >= FGET_RANGE_MIN
+        ):
+            conn.close()
+            if check != 'resume':
+                Path(f'{file}.part.json').unlink(missing_ok=True)
+                Path(f'{file}.part').unlink(missing_ok=True)
+            try:
+                self._fetch_ranges(url, file, size, data)
+            except RangeError:
+                if self._show_progress:
+                    print()
+                Path(f'{file}.part.json').unlink(missing_ok=True)
+                Path(f'{file}.part').unlink(missing_ok=True)
+                # pylint: disable=consider-using-with
+                conn = urllib.request.urlopen(url)
+                # pylint: enable=consider-using-with
+                self._fetch_stream(url, conn, file, data, 'download')
+        else:
+            self._fetch_stream(url, conn, file, data, check)
+
+        if not self._show_progress:
+            print(f"  => {file} [{size}/{size}]")
+        path_tmp = Path(f'{file}.part')
+        os.utime(path_tmp, (mtime, mtime))
+        try:
+            path_tmp.replace(file)
+            Path(f'{path_tmp}.json').unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _fetch_stream(
+        self,
+        url: str,
+        conn: http.client.HTTPResponse,
+        file: str,
+        data: dict,
+        check: str,
+    ) -> None:
+        """
+        Fetch file over single connection (resume contiguous part).
+        """
+        size = data['size']
+        ranges = self._read_ranges(file)
+        if (
+            'Accept-Ranges' in conn.info() and
+            check == 'resume' and
+            ranges and
+            ranges[0][0] == 0
+        ):
+            tmpsize = ranges[0][1]
+            try:
+                os.truncate(f'{file}.part', tmpsize)
+            except OSError:
+                tmpsize = 0
             req = urllib.request.Request(url, headers={
                 'Range': 'bytes='+str(tmpsize)+'-',
                 'User-Agent': Config().get('web_agent'),
@@ -226,25 +478,21 @@ class Main:
         try:
             with Path(f'{file}.part').open(mode) as ofile:
                 while True:
+                    if self._stop.is_set():
+                        raise KeyboardInterrupt
                     chunk = conn.read(self._chunk_size)
                     if not chunk:
                         break
                     tmpsize += len(chunk)
                     ofile.write(chunk)
-                    print(f"\r  => {file} [{tmpsize}/{size}]", end='')
+                    if self._show_progress:
+                        print(f"\r  => {file} [{tmpsize}/{size}]", end='')
         except PermissionError as exception:
             raise SystemExit(
                 f'{sys.argv[0]}: Cannot create "{file}" file.',
             ) from exception
-        print()
-
-        path_tmp = Path(f'{file}.part')
-        os.utime(path_tmp, (mtime, mtime))
-        try:
-            path_tmp.replace(file)
-            Path(f'{path_tmp}+.json')
-        except OSError:
-            pass
+        if self._show_progress:
+            print()
 
     def _get_url(self, url: str) -> None:
         print(url)
@@ -281,13 +529,41 @@ class Main:
 
         self._chunk_size = 131072
         self._urls = options.get_urls()
-
-        for url in self._urls:
-            self._get_url(url)
+        self._split = options.get_split()
+        self._lock = threading.Lock()
+        self._progress: dict = {}
+        self._show_progress = options.get_jobs() == 1 or len(self._urls) == 1
+        self._stop = threading.Event()
+
+        if self._show_progress:
+            for url in self._urls:
+                self._get_url(url)
+            return 0
+
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=options.get_jobs(),
+        )
+        futures = [pool.submit(self._get_url, x) for x in self._urls]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
 
         return 0
 
 
+class RangeError(Exception):
+    """
+    Range request not supported error.
+    """
+
+
 if __name__ == '__main__':
     if '--pydoc' in sys.argv:
         help(__name__)
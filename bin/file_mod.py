@@ -5,6 +5,7 @@ Python file handling utility module
 Copyright GPL v2: 2006-2025 By Dr Colin Kong
 """
 
+import errno
 import getpass
 import os
 import re
@@ -13,8 +14,11 @@ import time
 from pathlib import Path
 from typing import Any, Union
 
-RELEASE = '2.9.0'
-VERSION = 20251221
+if os.name != 'nt':
+    import fcntl
+
+RELEASE = '2.10.0'
+VERSION = 20261019
 
 
 class FileStat:
@@ -200,6 +204,115 @@ class FileUtil:
     This class contains file utilites.
     """
 
+    @staticmethod
+    def _copy_file_range(
+        ifd: int,
+        ofd: int,
+        offset: int,
+        end: int,
+        out_offset: int,
+    ) -> bool:
+        if not hasattr(os, 'copy_file_range'):
+            return False
+        try:
+            while offset < end:
+                nbytes = os.copy_file_range(
+                    ifd,
+                    ofd,
+                    end - offset,
+                    offset,
+                    out_offset,
+                )
+                if nbytes == 0:
+                    break
+                offset += nbytes
+                out_offset += nbytes
+        except OSError as exception:
+            if exception.errno in (
+                errno.EXDEV,
+                errno.ENOSYS,
+                errno.EINVAL,
+                errno.EOPNOTSUPP,
+            ):
+                return False
+            raise
+        return True
+
+    @staticmethod
+    def _sendfile(
+        ifd: int,
+        ofd: int,
+        offset: int,
+        end: int,
+        out_offset: int,
+    ) -> bool:
+        if not hasattr(os, 'sendfile') or not sys.platform.startswith('linux'):
+            return False
+        try:
+            os.lseek(ofd, out_offset, os.SEEK_SET)
+            while offset < end:
+                nbytes = os.sendfile(ofd, ifd, offset, end - offset)
+                if nbytes == 0:
+                    break
+                offset += nbytes
+        except OSError as exception:
+            if exception.errno in (errno.ENOSYS, errno.EINVAL):
+                return False
+            raise
+        return True
+
+    @staticmethod
+    def clone(ifd: int, ofd: int) -> bool:
+        """
+        Share source extents with target using reflink (False if unsupported).
+
+        ifd = Source file descriptor
+        ofd = Target file descriptor
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            # pylint: disable=possibly-used-before-assignment
+            fcntl.ioctl(ofd, 0x40049409, ifd)  # FICLONE
+        except OSError:
+            return False
+        return True
+
+    @classmethod
+    def copy_range(
+        cls,
+        ifd: int,
+        ofd: int,
+        offset: int,
+        size: int,
+        out_offset: int = None,
+    ) -> None:
+        """
+        Copy bytes between files in the kernel where possible.
+
+        ifd = Source file descriptor
+        ofd = Target file descriptor
+        offset = Source offset
+        size = Number of bytes
+        out_offset = Target offset (None for current position)
+        """
+        if out_offset is None:
+            out_offset = os.lseek(ofd, 0, os.SEEK_CUR)
+        end = offset + size
+
+        if (
+            cls._copy_file_range(ifd, ofd, offset, end, out_offset) or
+            cls._sendfile(ifd, ofd, offset, end, out_offset)
+        ):
+            return
+        while offset < end:
+            chunk = os.pread(ifd, min(end - offset, 131072), offset)
+            if not chunk:
+                break
+            os.pwrite(ofd, chunk, out_offset)
+            offset += len(chunk)
+            out_offset += len(chunk)
+
     @staticmethod
     def newest(files: list) -> str:
         """
@@ -11,7 +11,7 @@ import sys
 from pathlib import Path
 from typing import Iterator, List, Union
 
-from command_mod import LooseVersion
+from command_mod import version_key
 from file_mod import FileStat
 
 
@@ -185,7 +185,7 @@ class Main:
         elif order == 'version':
             file_stats = sorted(
                 file_stats,
-                key=lambda s: LooseVersion(s.get_file()),
+                key=lambda s: version_key(s.get_file()),
             )
         if options.get_reverse_flag():
             return reversed(file_stats)
@@ -4,18 +4,21 @@ Calculate PAR2 parity and repair tool.
 """
 
 import argparse
+import concurrent.futures
 import logging
 import os
 import signal
 import sys
+import threading
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 from command_mod import Command
 from logging_mod import ColoredFormatter
-from subtask_mod import Task
+from subtask_mod import Batch
 
 IGNORE_SUFFIXES = ('.fsum', '.md5', '.md5sum', '.par2')
+PAR2_MEMORY = 256
 
 logger = logging.getLogger(__name__)
 console_handler = logging.StreamHandler()
@@ -45,9 +48,21 @@ class Options:
         """
         return self._par2
 
+    def get_verify_flag(self) -> bool:
+        """
+        Return verify flag.
+        """
+        return self._args.verify_flag
+
     def _parse_args(self, args: List[str]) -> None:
         parser = argparse.ArgumentParser(description="Parity and repair tool.")
 
+        parser.add_argument(
+            '-v',
+            dest='verify_flag',
+            action='store_true',
+            help="Verify files against existing parity.",
+        )
         parser.add_argument(
             'files',
             nargs='*',
@@ -62,10 +77,14 @@ class Options:
         Parse arguments
         """
         self._par2 = Command('par2', errors='stop')
-        self._par2.set_args(['c', '-q', '-n1', '-r1'])
 
         self._parse_args(args[1:])
 
+        if self._args.verify_flag:
+            self._par2.set_args(['v', '-q'])
+        else:
+            self._par2.set_args(['c', '-q', '-n1', '-r1'])
+
 
 class Main:
     """
@@ -120,52 +139,140 @@ class Main:
             if not paths:
                 os.removedirs(directory_path)
 
+    @staticmethod
+    def _get_threads() -> Tuple[int, int]:
+        """
+        Return number of par2 workers (limited by cores and available
+        memory) and memory in MB for each worker.
+        """
+        threads = os.cpu_count() or 1
+        try:
+            with Path('/proc/meminfo').open(errors='replace') as ifile:
+                for line in ifile:
+                    if line.startswith('MemAvailable:'):
+                        memory = int(line.split()[1]) // 1024
+                        threads = max(1, min(threads, memory // PAR2_MEMORY))
+                        return threads, memory // threads
+        except (OSError, ValueError):
+            pass
+        return threads, 0
+
+    @staticmethod
+    def _is_job(path: Path, par_path: Path, verify: bool) -> bool:
+        """
+        Return True if file parity needs creating (or verifying).
+        """
+        if path.name.startswith('...') and path.suffix == '.par2':
+            name = path.name[3:-5]
+            if name.endswith('.vol0+1'):
+                name = name[:-7]
+            if not verify and name and Path(path.parent, name).is_file():
+                logger.warning("Deleting old: %s", path)
+                path.unlink(missing_ok=True)
+            return False
+        if len(path.name) == 1 or path.suffix in IGNORE_SUFFIXES:
+            return False
+
+        if not par_path.is_file():
+            return not verify
+        if int(path.stat().st_mtime) != int(par_path.stat().st_mtime):
+            if verify:
+                logger.warning("Stale parity: %s", par_path)
+            return not verify
+        return verify
+
     @classmethod
-    def _update(cls, cmdline: List[str], paths: List[Path]) -> None:
+    def _scan(cls, paths: List[Path], verify: bool) -> List[Tuple[Path, Path]]:
+        """
+        Walk tree once and return list of (file, parity file) to process.
+        """
+        jobs = []
         for path in sorted(paths):
             if path.name == '...':
                 continue
-            directory_path = path.parent
-            name = path.name
-            if not directory_path:
-                directory_path = Path(os.curdir)
             if path.is_dir():
-                cls._check_3dot_directory(Path(path, '...'))
-                cls._update(cmdline, list(path.glob('*')))
+                if not verify:
+                    cls._check_3dot_directory(Path(path, '...'))
+                jobs.extend(cls._scan(list(path.glob('*')), verify))
             elif (
                 path.is_file() and
                 not path.is_symlink() and
                 path.stat().st_size
             ):
-                suffix = path.suffix
-                if len(path.name) == 1 or suffix in IGNORE_SUFFIXES:
-                    continue
-
-                fpar_path = Path(directory_path, '...')
-                file_time = int(path.stat().st_mtime)
-                par_path = Path(directory_path, '...', f'{name}.par2')
-                if (
-                    not par_path.is_file() or
-                    file_time != int(par_path.stat().st_mtime)
-                ):
-                    par0_path = Path(directory_path, '....par2')
-                    par1_path = Path(directory_path, '....vol0+1.par2')
-                    par0_path.unlink(missing_ok=True)
-                    par1_path.unlink(missing_ok=True)
-                    size = path.stat().st_size // 400 * 4 + 4
-                    task = Task(cmdline + [f'-s{size}', par0_path, path])
-                    cls._create_3dot_directory(fpar_path)
-                    task.run(pattern='^$', replace=(
-                        'Opening: ',
-                        f'Opening: {directory_path}/',
-                    ))
-                    if task.get_exitcode() == 0:
-                        par0_path.unlink()
-                        try:
-                            par1_path.replace(par_path)
-                            os.utime(par_path, (file_time, file_time))
-                        except OSError:
-                            pass
+                par_path = Path(path.parent, '...', f'{path.name}.par2')
+                if cls._is_job(path, par_path, verify):
+                    jobs.append((path, par_path))
+
+        if not verify:
+            for path in {x.parent for _, x in jobs}:
+                cls._create_3dot_directory(path)
+
+        return jobs
+
+    @staticmethod
+    def _create(cmdline: List[str], path: Path, par_path: Path) -> Batch:
+        file_time = int(path.stat().st_mtime)
+        par0_path = Path(path.parent, f'...{path.name}.par2')
+        par1_path = Path(path.parent, f'...{path.name}.vol0+1.par2')
+        par0_path.unlink(missing_ok=True)
+        par1_path.unlink(missing_ok=True)
+        size = path.stat().st_size // 400 * 4 + 4
+        task = Batch(cmdline + [f'-s{size}', str(par0_path), str(path)])
+        task.run(error2output=True)
+        if task.get_exitcode() == 0:
+            par0_path.unlink(missing_ok=True)
+            try:
+                par1_path.replace(par_path)
+                os.utime(par_path, (file_time, file_time))
+            except OSError:
+                pass
+        else:
+            par0_path.unlink(missing_ok=True)
+            par1_path.unlink(missing_ok=True)
+
+        return task
+
+    @staticmethod
+    def _verify(cmdline: List[str], path: Path, par_path: Path) -> Batch:
+        task = Batch(cmdline + [f'-B{path.parent.resolve()}', str(par_path)])
+        task.run(error2output=True)
+
+        return task
+
+    @classmethod
+    def _run_jobs(
+        cls,
+        cmdline: List[str],
+        jobs: List[Tuple[Path, Path]],
+        verify: bool,
+    ) -> int:
+        """
+        Run par2 jobs in worker pool with non-interleaved output.
+        """
+        threads, memory = cls._get_threads()
+        cmdline = cmdline + [f'-t{max(1, (os.cpu_count() or 1) // threads)}']
+        if memory:
+            cmdline.append(f'-m{memory}')
+        function = cls._verify if verify else cls._create
+        lock = threading.Lock()
+
+        def _run(job: Tuple[Path, Path]) -> int:
+            task = function(cmdline, *job)
+            with lock:
+                for line in task.get_output():
+                    if line:
+                        print(f"{job[0]}: {line}")
+                if task.get_exitcode():
+                    if verify:
+                        logger.error("Damaged: %s", job[0])
+                    else:
+                        logger.error("Failed: %s", job[0])
+            return task.get_exitcode()
+
+        with concurrent.futures.ThreadPoolExecutor(threads) as pool:
+            exitcodes = list(pool.map(_run, jobs))
+
+        return 1 if any(exitcodes) else 0
 
     @classmethod
     def run(cls) -> int:
@@ -175,9 +282,10 @@ class Main:
         options = Options()
 
         cmdline = options.get_par2().get_cmdline()
-        cls._update(cmdline, [Path(x) for x in options.get_files()])
+        verify = options.get_verify_flag()
+        jobs = cls._scan([Path(x) for x in options.get_files()], verify)
 
-        return 0
+        return cls._run_jobs(cmdline, jobs, verify)
 
 
 if __name__ == '__main__':
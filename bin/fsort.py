@@ -10,7 +10,7 @@ import sys
 from pathlib import Path
 from typing import List
 
-from command_mod import LooseVersion
+from command_mod import version_key
 
 
 class Options:
@@ -127,11 +127,7 @@ class Main:
                 lines.append(line.rstrip('\n'))
 
         if options.get_order() == 'version':
-            lines = sorted(
-                lines,
-                key=lambda  # pylint: disable=unnecessary-lambda
-                s: LooseVersion(s),
-            )
+            lines = sorted(lines, key=version_key)
         else:
             lines = sorted(lines)
         if options.get_reverse_flag():
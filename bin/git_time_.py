@@ -8,10 +8,15 @@ import os
 import signal
 import sys
 from pathlib import Path
-from typing import List
+from typing import Dict, Generator, List
 
 import git  # type: ignore
 
+from command_mod import Command
+from subtask_mod import Child
+
+MAX_PATHSPECS = 64
+
 
 class Options:
     """
@@ -89,6 +94,94 @@ class Main:
                 return open(str(file), *args, **kwargs)
             Path.open = _open  # type: ignore
 
+    @classmethod
+    def _get_files(cls, files: List[str], recursive: bool) -> List[Path]:
+        paths = []
+        for path in [Path(x) for x in files]:
+            if path.is_file():
+                paths.append(path)
+            elif recursive and path.is_dir() and path.name != '.git':
+                paths.extend(cls._get_files(
+                    [str(x) for x in path.glob('*')],
+                    recursive,
+                ))
+        return paths
+
+    @staticmethod
+    def _read_git(
+        directory: Path,
+        args: List[str],
+    ) -> Generator[str, None, None]:
+        """
+        Yield NUL separated fields of git output (stops git when closed).
+        """
+        git_command = Command('git', errors='stop')
+        git_command.set_args(['-C', str(directory)] + args)
+        child = Child(git_command.get_cmdline()).run()
+        child.stdin.close()
+
+        pending = b''
+        try:
+            while True:
+                chunk = child.stdout.read(65536)
+                if not chunk:
+                    break
+                fields = (pending + chunk).split(b'\0')
+                pending = fields.pop()
+                for field in fields:
+                    yield os.fsdecode(field)
+            if pending:
+                yield os.fsdecode(pending)
+        finally:
+            child.stdout.close()
+            child.stderr.close()
+            child.kill()
+            child.wait()
+
+    @classmethod
+    def _get_times(
+        cls,
+        top: Path,
+        files: List[str],
+        paths: Dict[str, List[Path]],
+    ) -> Dict[str, int]:
+        """
+        Walk commit log once from HEAD and return first seen commit time
+        for each path (stops as soon as all paths are resolved).
+        """
+        fields = cls._read_git(top, [
+            'log',
+            '-z',
+            '--name-only',
+            '--no-renames',
+            '--format=%x00%ct',
+            '--',
+            *files,
+        ])
+
+        # Commits are "\0<time>\0" followed by "\n<file>\0<file>\0..."
+        times: Dict[str, int] = {}
+        commit_time = 0
+        state = ''
+        for field in fields:
+            if not field:
+                state = 'time'
+                continue
+            if state == 'time':
+                commit_time = int(field)
+                state = 'header'
+                continue
+            if state == 'header':
+                field = field[1:] if field.startswith('\n') else field
+                state = ''
+            if field in paths and field not in times:
+                times[field] = commit_time
+                if len(times) == len(paths):
+                    break
+        fields.close()
+
+        return times
+
     @classmethod
     def _update(
         cls,
@@ -96,27 +189,38 @@ class Main:
         files: List[str],
         recursive: bool,
     ) -> None:
-        for path in [Path(x) for x in files]:
-            if path.is_file():
+        top = Path(repo.working_tree_dir).resolve()
+        tracked = set(cls._read_git(top, ['ls-files', '-z']))
+        paths: Dict[str, List[Path]] = {}
+        for path in cls._get_files(files, recursive):
+            try:
+                name = path.resolve().relative_to(top).as_posix()
+            except ValueError:  # Outside git repository
+                continue
+            if name in tracked:
+                paths.setdefault(name, []).append(path)
+        if not paths:
+            return
+
+        # Limit log walk to arguments (large pathspecs are slow to match)
+        specs = [
+            x
+            for x in [Path(x).resolve() for x in files]
+            if x == top or top in x.parents
+        ]
+        if len(specs) > MAX_PATHSPECS:
+            specs = []
+
+        for name, commit_time in cls._get_times(
+            top,
+            [str(x) for x in specs],
+            paths,
+        ).items():
+            for path in paths[name]:
                 try:
-                    commit = next(repo.iter_commits(
-                        paths=str(path.resolve()),
-                        max_count=1,
-                    ))
-                except StopIteration:  # Non git file
+                    os.utime(path, (commit_time, commit_time))
+                except (IndexError, ValueError):
                     pass
-                else:
-                    author_time = commit.committed_date
-                    try:
-                        os.utime(path, (author_time, author_time))
-                    except (IndexError, ValueError):
-                        pass
-            elif recursive and path.is_dir():
-                cls._update(
-                    repo,
-                    [str(x) for x in path.glob('*')],
-                    recursive,
-                )
 
     def run(self) -> int:
         """
@@ -4,14 +4,18 @@ Sandbox a simple Python HTTP server.
 """
 
 import argparse
+import email.utils
 import http.server
+import io
 import os
+import re
 import signal
 import socket
 import socketserver
 import sys
+from http import HTTPStatus
 from pathlib import Path
-from typing import List
+from typing import Any, List, Optional, Tuple
 
 from network_mod import SandboxFile
 from subtask_mod import Task
@@ -83,15 +87,132 @@ class Options:
             )
 
 
-class MyTCPServer(socketserver.TCPServer):
+class MyTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     """
-    Enable immediate port reuse.
+    Threaded server with immediate port reuse.
     """
+    daemon_threads = True
 
     def server_bind(self) -> None:
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.socket.bind(self.server_address)
 
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    HTTP/1.1 keep-alive handler with Range, ETag and sendfile support.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    timeout = 60
+    is_range = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._range: Optional[Tuple[int, int]] = None
+        super().__init__(*args, **kwargs)
+
+    def _is_not_modified(self, etag: str, mtime: float) -> bool:
+        if 'If-None-Match' in self.headers:
+            tags = self.headers['If-None-Match'].split(',')
+            return bool({etag, '*'} & {x.strip() for x in tags})
+        if 'If-Modified-Since' in self.headers:
+            try:
+                since = email.utils.parsedate_to_datetime(
+                    self.headers['If-Modified-Since'],
+                )
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return int(mtime) <= since.timestamp()
+        return False
+
+    def _get_range(self, size: int, etag: str, modified: str) -> Any:
+        """
+        Return (start, end) for single byte range, None for whole file
+        or False if range not satisfiable.
+        """
+        if 'Range' not in self.headers:
+            return None
+        if self.headers.get('If-Range', etag) not in (etag, modified):
+            return None
+        match = self.is_range.match(self.headers['Range'].strip())
+        if not match or match.groups() == ('', ''):
+            return None  # Multiple ranges not supported
+        first, last = match.groups()
+        if not first:
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        if start > end or start >= size:
+            return False
+        return start, end
+
+    def send_head(self) -> Any:
+        self._range = None
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) or path.endswith('/'):
+            return super().send_head()
+        try:
+            file = open(path, 'rb')  # pylint: disable=consider-using-with
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            file_stat = os.fstat(file.fileno())
+            etag = f'"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"'
+            modified = self.date_time_string(int(file_stat.st_mtime))
+            if self._is_not_modified(etag, file_stat.st_mtime):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', modified)
+                self.end_headers()
+                file.close()
+                return None
+
+            size = file_stat.st_size
+            byte_range = self._get_range(size, etag, modified)
+            if byte_range is False:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                file.close()
+                return None
+            if byte_range:
+                start, end = byte_range
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header(
+                    'Content-Range',
+                    f'bytes {start}-{end}/{size}',
+                )
+            else:
+                start, end = 0, size - 1
+                self.send_response(HTTPStatus.OK)
+            self.send_header('Content-type', self.guess_type(path))
+            self.send_header('Content-Length', str(end - start + 1))
+            self.send_header('Last-Modified', modified)
+            self.send_header('ETag', etag)
+            self.send_header('Accept-Ranges', 'bytes')
+            self.end_headers()
+            self._range = (start, end - start + 1)
+            return file
+        except Exception:
+            file.close()
+            raise
+
+    def copyfile(self, source: Any, outputfile: Any) -> None:
+        if self._range and isinstance(source, io.BufferedReader):
+            offset, count = self._range
+            if count > 0:
+                self.connection.sendfile(source, offset, count)
+        else:
+            super().copyfile(source, outputfile)
+
 
 class Main:
     """
@@ -162,19 +283,19 @@ class Main:
             ) from exception
 
         port = options.get_port()
-        http.server.SimpleHTTPRequestHandler.extensions_map['.log'] = (
-            'text/plain')
+        MyHTTPRequestHandler.extensions_map['.log'] = 'text/plain'
 
         try:
-            httpd = MyTCPServer(
-                ('', port),
-                http.server.SimpleHTTPRequestHandler
-            )
+            httpd = MyTCPServer(('', port), MyHTTPRequestHandler)
         except OSError as exception:
             raise SystemExit(
                 f'{sys.argv[0]}: Cannot bind to address "localhost:{port}".',
             ) from exception
 
+        # Client disconnects must not kill other connections
+        if hasattr(signal, 'SIGPIPE'):
+            signal.signal(signal.SIGPIPE, signal.SIG_IGN)
+
         print(f'Serving "{os.getcwd()}" at "http://localhost:{port}"...')
         httpd.serve_forever()
 
@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import List
 
 from command_mod import Command
-from subtask_mod import Batch
+from subtask_mod import Batch, BatchPool
 
 
 class Options:
@@ -89,20 +89,23 @@ class Main:
         errors = []
         jpeginfo = Command('jpeginfo', errors='stop')
         jpeginfo.set_args(['--info', '--check'])
+        pool = BatchPool()
         for directory_path in [Path(x) for x in directories]:
             if directory_path.is_dir():
                 paths = []
                 for path in Path(directory_path).glob('*.*'):
                     if path.suffix.lower() in ('.jpg', '.jpeg'):
                         paths.append(path)
-                if paths:
-                    task = Batch(jpeginfo.get_cmdline() + paths)
-                    task.run()
-                    for line in task.get_output():
-                        if '[ERROR]' in line:
-                            errors.append(line)
-                        else:
-                            print(line)
+                for i in range(0, len(paths), 64):
+                    pool.add(Batch(jpeginfo.get_cmdline() + paths[i:i+64]))
+        pool.run()
+
+        for task in pool.get_tasks():
+            for line in task.get_output():
+                if '[ERROR]' in line:
+                    errors.append(line)
+                else:
+                    print(line)
         if errors:
             for line in errors:
                 print(line)
@@ -4,6 +4,7 @@ Convert BSON/JSON/XML/YAML to JSON file.
 """
 
 import argparse
+import filecmp
 import os
 import signal
 import sys
@@ -123,24 +124,30 @@ class Main:
                 json_paths.append(path)
                 continue
 
+            json_path = path.with_suffix('.json')
+            tmp_path = Path(f'{json_path}.part')
             try:
-                data.read(path)
+                data.iwrite(
+                    tmp_path,
+                    data.iread(path),
+                    compact=compact,
+                    config='JSON',
+                )
             except ReadConfigError as exception:
                 raise SystemExit(f"{path}: {exception}") from exception
-            json_path = path.with_suffix('.json')
-            try:
-                old_json = json_path.read_bytes()
-            except (ConfigError, OSError):
-                old_json = None
-            new_json = data.encode(config='JSON', compact=compact)
-            if new_json != old_json:
+            except ConfigError as exception:
+                raise SystemExit(
+                    f'{sys.argv[0]}: Cannot create "{json_path}" file.'
+                ) from exception
+            if json_path.is_file() and filecmp.cmp(
+                tmp_path,
+                json_path,
+                shallow=False,
+            ):
+                tmp_path.unlink()
+            else:
                 print(f'Converting "{path}" to "{json_path}"...')
-                try:
-                    json_path.write_bytes(new_json)
-                except OSError as exception:
-                    raise SystemExit(
-                        f'{sys.argv[0]}: Cannot create "{json_path}" file.'
-                    ) from exception
+                tmp_path.replace(json_path)
 
         if json_paths:
             command = Command('jsonformat', errors='stop')
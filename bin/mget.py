@@ -4,19 +4,30 @@ M3U8 streaming video downloader.
 """
 
 import argparse
+import concurrent.futures
 import glob
 import hashlib
+import http.client
 import os
 import shutil
 import signal
+import subprocess
 import sys
+import threading
 import time
+import urllib.request
 from pathlib import Path
-from typing import Any, BinaryIO, List
+from typing import Any, List
 
 from command_mod import Command
+from config_mod import Config
 from subtask_mod import Task
 
+MGET_ARG_MAX = 131072  # Linux MAX_ARG_STRLEN
+MGET_RETRIES = 3
+MGET_THREADS = 8
+MGET_TIMEOUT = 30
+
 
 class Options:
     """
@@ -91,9 +102,10 @@ class VideoDownloader:
         self._output = options.get_output()
         self._url = options.get_url()
 
-        self._wget = Command('wget', errors='stop')
+        self._user_agent = Config().get('web_agent')
         self._directory_path = Path(f'{self._output}.parts')
         self._m3u8_file = Path(self._directory_path, Path(self._url).name)
+        self._lock = threading.Lock()
 
     def _write_resume(self) -> None:
         """
@@ -110,6 +122,31 @@ class VideoDownloader:
                 print(line, file=ofile)
         resume_file.chmod(0o755)
 
+    def _download(self, url: str, path: Path) -> bool:
+        """
+        Download URL to file (via ".part" file). Return True if successful.
+        """
+        path_tmp = Path(f'{path}.part')
+        request = urllib.request.Request(
+            url,
+            headers={'User-Agent': self._user_agent},
+        )
+        try:
+            with urllib.request.urlopen(
+                request,
+                timeout=MGET_TIMEOUT,
+            ) as conn:
+                with path_tmp.open('wb') as ofile:
+                    shutil.copyfileobj(conn, ofile, 131072)
+                size = conn.headers.get('Content-Length')
+            if size and path_tmp.stat().st_size != int(size):
+                raise http.client.IncompleteRead(b'')
+            path_tmp.replace(path)
+        except (OSError, ValueError, http.client.HTTPException):
+            path_tmp.unlink(missing_ok=True)
+            return False
+        return True
+
     def get_m3u8(self) -> None:
         """
         Download M3U8 file.
@@ -120,11 +157,8 @@ class VideoDownloader:
             self._directory_path.mkdir(parents=True)
         self._write_resume()
 
-        self._wget.set_args(['-O', self._m3u8_file, self._url])
-        task = Task(self._wget.get_cmdline())
-        task.run()
-        if task.get_exitcode():
-            raise SystemExit(1)
+        if not self._download(self._url, self._m3u8_file):
+            raise SystemExit(f"{sys.argv[0]}: Cannot download: {self._url}")
 
     def _get_urls(self) -> dict:
         """
@@ -138,7 +172,7 @@ class VideoDownloader:
             with path.open(errors='replace') as ifile:
                 for line in ifile:
                     line = line.strip()
-                    if not line.startswith('#'):
+                    if line and not line.startswith('#'):
                         url = '/'.join([base_url, line])
                         if '-chunk-' in line:
                             part = int(line.split('-chunk-')[1].split('.')[0])
@@ -156,85 +190,133 @@ class VideoDownloader:
             )
         return chunks
 
-    def _get_chunk(self, path: Path, urls: List[str]) -> None:
+    def _get_chunk(self, path: Path, urls: List[str]) -> bool:
         """
-        Download chunk from available URLs.
+        Download chunk trying each mirror URL with retries.
         """
-        for url in urls:
-            Path(f'{path}.part').unlink(missing_ok=True)
-            self._wget.set_args(['-O', path, url])
-            task = Task(self._wget.get_cmdline())
-            task.run()
-            if task.get_exitcode() == 0:
-                return
-        time.sleep(2)
+        for retry in range(MGET_RETRIES):
+            for url in urls:
+                if self._download(url, path):
+                    return True
+            time.sleep(2 * (retry + 1))
+        return False
 
     def get_parts(self) -> None:
         """
-        Download video parts.
+        Download video parts concurrently (resume existing parts).
         """
         chunks = self._get_urls()
         nchunks = len(chunks)
-        nfiles = len(glob.glob(f'{self._m3u8_file}-c*.ts'))
         status_file = Path(f'{self._m3u8_file}-status.txt')
 
-        while nfiles != nchunks:
-            for part, urls in sorted(chunks.items()):
-                path = Path(f"{self._m3u8_file}-c{part:05d}.ts")
-                if path.is_file():
-                    continue
-
-                self._get_chunk(path, urls)
-                if path.is_file():
-                    nfiles += 1
-                    with status_file.open('w') as ofile:
-                        print(
-                            f"{self._output}: {nfiles}/{nchunks}",
-                            file=ofile,
-                        )
-
-            time.sleep(10)
-
-    @staticmethod
-    def _copy(ifile: BinaryIO, ofile: BinaryIO) -> None:
         while True:
-            chunk = ifile.read(131072)
-            if not chunk:
+            missing = {
+                Path(f"{self._m3u8_file}-c{part:05d}.ts"): urls
+                for part, urls in sorted(chunks.items())
+                if not Path(f"{self._m3u8_file}-c{part:05d}.ts").is_file()
+            }
+            nfiles = nchunks - len(missing)
+            if not missing:
                 break
-            ofile.write(chunk)
 
-    def join(self) -> None:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=MGET_THREADS,
+            ) as pool:
+                futures = [
+                    pool.submit(self._get_chunk, path, urls)
+                    for path, urls in missing.items()
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    if future.result():
+                        with self._lock:
+                            nfiles += 1
+                            print(f"{self._output}: {nfiles}/{nchunks}")
+                            with status_file.open('w') as ofile:
+                                print(
+                                    f"{self._output}: {nfiles}/{nchunks}",
+                                    file=ofile,
+                                )
+
+            if nfiles != nchunks:
+                time.sleep(10)
+
+    @staticmethod
+    def _join_pipe(
+        ffmpeg: Command,
+        chunk_files: List[str],
+        mp4_path: Path,
+    ) -> int:
         """
-        Join video parts.
+        Pipe video parts to ffmpeg in order and return exit status.
         """
-        chunk_files = sorted(glob.glob(f'{self._m3u8_file}-c*.ts'))
-        full_path = Path(f'{self._m3u8_file}-full.ts')
-        with full_path.open('wb') as ofile:
+        ffmpeg.set_args([
+            '-f',
+            'mpegts',
+            '-i',
+            '-',
+            '-acodec',
+            'copy',
+            '-vcodec',
+            'copy',
+            mp4_path,
+        ])
+        cmdline = [str(x) for x in ffmpeg.get_cmdline()]
+        try:
+            child = subprocess.Popen(  # pylint: disable=consider-using-with
+                cmdline,
+                stdin=subprocess.PIPE,
+            )
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Error in calling "{cmdline[0]}" program.',
+            ) from exception
+        try:
             for path in [Path(x) for x in chunk_files]:
                 print(f"{path}...")
                 try:
                     with path.open('rb') as ifile:
-                        self._copy(ifile, ofile)
+                        shutil.copyfileobj(ifile, child.stdin, 131072)
+                except BrokenPipeError:
+                    break
                 except OSError as exception:
+                    child.kill()
                     raise SystemExit(
                         f"{sys.argv[0]}: Cannot read file: {path}",
                     ) from exception
+        finally:
+            try:
+                child.stdin.close()
+            except BrokenPipeError:
+                pass
+        return child.wait()
 
+    def join(self) -> None:
+        """
+        Join video parts (ffmpeg "concat:" protocol reads parts in order).
+        """
+        chunk_files = sorted(glob.glob(f'{self._m3u8_file}-c*.ts'))
         mp4_path = Path(f'{self._m3u8_file}-full.mp4')
         mp4_path.unlink(missing_ok=True)
         ffmpeg = Command('ffmpeg', errors='stop')
-        ffmpeg.set_args([
-            '-i',
-            full_path,
-            '-acodec',
-            'copy',
-            '-vcodec',
-            'copy',
-            mp4_path,
-        ])
-        task = Task(ffmpeg.get_cmdline())
-        task.run()
-        if task.get_exitcode():
+
+        names = [Path(x).name for x in chunk_files]
+        source = f"concat:{'|'.join(names)}"
+        if len(source) < MGET_ARG_MAX and not any('|' in x for x in names):
+            ffmpeg.set_args([
+                '-i',
+                source,
+                '-acodec',
+                'copy',
+                '-vcodec',
+                'copy',
+                mp4_path.resolve(),
+            ])
+            task = Task(ffmpeg.get_cmdline())
+            task.run(directory=self._m3u8_file.parent)
+            exitcode = task.get_exitcode()
+        else:
+            exitcode = self._join_pipe(ffmpeg, chunk_files, mp4_path)
+        if exitcode:
             raise SystemExit(1)
 
         source_time = int(self._m3u8_file.stat().st_mtime)
@@ -3,16 +3,70 @@
 Show local IPv4 network neighbours
 """
 
+import argparse
+import asyncio
+import concurrent.futures
 import dataclasses
 import ipaddress
 import json
 import signal
+import socket
 import sys
+import time
 from pathlib import Path
-from typing import Union
+from typing import List, Union
 
 from command_mod import Command
-from subtask_mod import Daemon, Batch
+from file_mod import FileError, FileUtil
+from subtask_mod import Batch
+
+DNS_TTL = 3600
+PROBE_PORT = 9  # Discard
+PROBE_THREADS = 256
+SCAN_HOSTS_MAX = 1024
+
+
+class Options:
+    """
+    Options class
+    """
+
+    def __init__(self) -> None:
+        self._args: argparse.Namespace = None
+        self.parse(sys.argv)
+
+    def get_timeout(self) -> float:
+        """
+        Return discovery deadline in seconds.
+        """
+        return self._args.timeout[0]
+
+    def _parse_args(self, args: List[str]) -> None:
+        parser = argparse.ArgumentParser(
+            description="Show local IPv4 network neighbours.",
+        )
+
+        parser.add_argument(
+            '-timeout',
+            nargs=1,
+            type=float,
+            default=[3.],
+            help="Select discovery deadline in seconds. Default is 3.",
+        )
+
+        self._args = parser.parse_args(args)
+
+    def parse(self, args: List[str]) -> None:
+        """
+        Parse arguments
+        """
+        self._parse_args(args[1:])
+
+        if self._args.timeout[0] <= 0:
+            raise SystemExit(
+                f"{sys.argv[0]}: You must specific a positive number "
+                "for discovery deadline.",
+            )
 
 
 @dataclasses.dataclass(order=True)
@@ -38,29 +92,78 @@ class LocalNetwork:
     LocalNetwork class
     """
 
-    def __init__(self) -> None:
+    def __init__(self, timeout: float = 3.) -> None:
         self._addresses: dict = {}
+        self._timeout = timeout
+        self._deadline = 0.
+
+    def _remaining(self) -> float:
+        return max(self._deadline - time.monotonic(), 0.)
 
     @staticmethod
-    def scan() -> None:
+    def get_subnets() -> List[ipaddress.IPv4Network]:
         """
-        Quick scan of all IPs in small subnets (ie 192.168.1.0/24)
+        Return small global subnets (ie 192.168.1.0/24)
         """
         ip = Command('ip', args=['addr'], errors='ignore')
-        nmap = Command('nmap', args=['-sn'], errors='ignore')
-        if ip.is_found() and nmap.is_found():
-            task = Batch(ip.get_cmdline())
-            task.run(pattern=r'inet \d.* .*global')
-            for line in task.get_output():
-                subnet = line.split()[1]
-                if int(subnet.rsplit('/', 1)[-1]) <= 26:  # 1024
-                    Daemon(nmap.get_cmdline() + [subnet]).run()
+        if not ip.is_found():
+            return []
+        task = Batch(ip.get_cmdline())
+        task.run(pattern=r'inet \d.* .*global')
+        subnets = []
+        for line in task.get_output():
+            subnet = ipaddress.IPv4Network(line.split()[1], strict=False)
+            if subnet.num_addresses <= SCAN_HOSTS_MAX:
+                subnets.append(subnet)
+        return subnets
+
+    async def _probe(
+        self,
+        ipaddr: str,
+        semaphore: asyncio.Semaphore,
+        timeout: float,
+    ) -> None:
+        async with semaphore:
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(ipaddr, PROBE_PORT),
+                    min(timeout, self._remaining()),
+                )
+                writer.close()
+            except (OSError, asyncio.TimeoutError):
+                pass
+
+    async def _sweep(self, subnets: List[ipaddress.IPv4Network]) -> None:
+        """
+        Send UDP and TCP probes to populate kernel neighbour table.
+        """
+        hosts = [str(x) for subnet in subnets for x in subnet.hosts()]
+        if not hosts:
+            return
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol,
+            family=socket.AF_INET,
+        )
+        try:
+            for ipaddr in hosts:
+                transport.sendto(b'', (ipaddr, PROBE_PORT))
+        finally:
+            transport.close()
+        semaphore = asyncio.Semaphore(PROBE_THREADS)
+        await asyncio.gather(*[
+            self._probe(ipaddr, semaphore, self._timeout / 2)
+            for ipaddr in hosts
+        ])
 
-    def _browse(self) -> None:
+    async def _browse(self) -> None:
         avahi_browse = Command('avahi-browse', args=['-artp'], errors='ignore')
         if avahi_browse.is_found():
             task = Batch(avahi_browse.get_cmdline())
-            task.run(pattern=r'^=.*IPv4')
+            await task.run_async(
+                pattern=r'^=.*IPv4',
+                timeout=self._remaining(),
+            )
             for line in task.get_output():
                 cols = line.split(';')
                 ipaddr = ipaddress.ip_address(cols[7])
@@ -73,19 +176,100 @@ class LocalNetwork:
                 )
 
     def _read_arp(self) -> None:
-        arp = Command('arp', pathextra=['/sbin'], errors='stop')
-        task = Batch(arp.get_cmdline())
-        task.run(pattern=':..:..:..:..:')
-        for line in task.get_output():
-            cols = line.split()
-            ipaddr = ipaddress.ip_address(cols[0])
-            ipnum = int(ipaddr)
-            if ipnum not in self._addresses:
-                self._addresses[ipnum] = Address(
-                    ipaddr,
-                    cols[2],
-                    cols[4],
-                )
+        """
+        Read kernel neighbour table ("/proc/net/arp" or "ip neigh").
+        """
+        neighbours = []
+        try:
+            with Path('/proc/net/arp').open(errors='replace') as ifile:
+                for line in ifile:
+                    cols = line.split()
+                    if len(cols) == 6 and cols[2].startswith('0x'):
+                        if int(cols[2], 16) & 0x2:  # ATF_COM
+                            neighbours.append((cols[0], cols[3], cols[5]))
+        except OSError:
+            ip = Command('ip', args=['-4', '-j', 'neigh'], errors='stop')
+            task = Batch(ip.get_cmdline())
+            task.run()
+            try:
+                neighbours = [
+                    (x['dst'], x['lladdr'], x['dev'])
+                    for x in json.loads('\n'.join(task.get_output()))
+                    if 'lladdr' in x
+                ]
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        for ipaddr, hwaddress, device in neighbours:
+            address = Address(ipaddress.ip_address(ipaddr), hwaddress, device)
+            self._addresses.setdefault(int(address.ipaddr), address)
+
+    async def _reverse_dns(self) -> None:
+        """
+        Reverse DNS lookup of hostnames (cached for DNS_TTL seconds).
+        """
+        path = Path(FileUtil.tmpdir(Path('.cache', 'netls')), 'names.json')
+        try:
+            cache = json.loads(path.read_text(errors='replace'))
+        except (OSError, ValueError):
+            cache = {}
+        now = time.time()
+        cache = {
+            key: value
+            for key, value in cache.items()
+            if isinstance(value, list) and value[1] > now - DNS_TTL
+        }
+
+        loop = asyncio.get_running_loop()
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=32)
+        addresses = [
+            x
+            for x in self._addresses.values()
+            if x.hostname == '-' and str(x.ipaddr) not in cache
+        ]
+        lookups = [
+            loop.run_in_executor(
+                pool,
+                socket.getnameinfo,
+                (str(x.ipaddr), 0),
+                socket.NI_NAMEREQD,
+            )
+            for x in addresses
+        ]
+        if lookups:
+            await asyncio.wait(lookups, timeout=max(self._remaining(), 0.5))
+        for lookup in lookups:
+            lookup.cancel()  # Cancel queued lookups so exit is not blocked
+        pool.shutdown(wait=False)
+        for address, lookup in zip(addresses, lookups):
+            if lookup.done() and not lookup.cancelled():
+                name = '-' if lookup.exception() else lookup.result()[0]
+                cache[str(address.ipaddr)] = [name, now]
+
+        for address in self._addresses.values():
+            if address.hostname == '-' and str(address.ipaddr) in cache:
+                address.set_hostname(cache[str(address.ipaddr)][0])
+        try:
+            path.write_text(json.dumps(cache))
+        except OSError:
+            pass
+
+    async def _discover(self) -> None:
+        self._deadline = time.monotonic() + self._timeout
+        browse = asyncio.ensure_future(self._browse())
+        await self._sweep(self.get_subnets())
+        self._read_arp()
+        await self._reverse_dns()
+        await browse
+
+    def discover(self) -> None:
+        """
+        Discover neighbours and resolve hostnames before deadline.
+        """
+        try:
+            asyncio.run(self._discover())
+        except FileError as exception:
+            raise SystemExit(f'{sys.argv[0]}: {exception}') from exception
 
     def _read_json(self) -> None:
         path = Path(Path.home(), '.config', 'netls.json')
@@ -108,10 +292,8 @@ class LocalNetwork:
 
     def resolve(self) -> None:
         """
-        Resolve IP address to hardware address and mDNS/DNS-SD hostnames
+        Resolve hardware address identities
         """
-        self._browse()
-        self._read_arp()
         self._read_json()
 
     def show(self) -> None:
@@ -156,8 +338,10 @@ class Main:
         """
         Start program
         """
-        network = LocalNetwork()
-        network.scan()
+        options = Options()
+
+        network = LocalNetwork(options.get_timeout())
+        network.discover()
         network.resolve()
         network.show()
 
@@ -4,18 +4,19 @@ Set the date and time via NTP pool
 """
 
 import argparse
+import asyncio
 import glob
 import logging
 import math
 import signal
 import socket
 import statistics
+import struct
 import sys
 import time
-from typing import Generator, List
+from typing import Dict, List, Tuple
 
 import dns.resolver  # type: ignore
-import ntplib  # type: ignore
 
 from command_mod import Command
 from file_mod import FileStat, FileUtil
@@ -28,10 +29,16 @@ DNS_SERVERS = [
     '1.1.1.1',
     '8.8.8.8',
 ]
+NTP_DEADLINE = 5.
+NTP_DELTA = 2208988800  # 1900-01-01 to 1970-01-01 in seconds
+NTP_INTERVAL = 1.
+NTP_OUTLIER = 0.1
+NTP_SAMPLES = 4
 NTP_SERVER = 'pool.ntp.org'
 NTP_SYNC_MAX = 8
 NTP_SYNC_MIN = 3
 NTP_SYNC_REPEAT = 3600
+NTP_TIMEOUT = 1.
 
 logger = logging.getLogger(__name__)
 console_handler = logging.StreamHandler()
@@ -76,7 +83,7 @@ class Options:
             '-u',
             dest='update_flag',
             action='store_true',
-            help="Apply average offset calculated.",
+            help="Apply offset calculated.",
         )
 
         self._args = parser.parse_args(args)
@@ -88,6 +95,158 @@ class Options:
         self._parse_args(args[1:])
 
 
+class NtpProtocol(asyncio.DatagramProtocol):
+    """
+    NTP client UDP protocol class
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        """
+        Queue received packet with receive time.
+        """
+        self._queue.put_nowait((data, time.time()))
+
+    def error_received(self, exc: Exception) -> None:
+        """
+        Queue empty packet for error (ie ICMP port unreachable).
+        """
+        self._queue.put_nowait((b'', time.time()))
+
+    async def receive(self) -> Tuple[bytes, float]:
+        """
+        Return next packet and receive time.
+        """
+        return await self._queue.get()
+
+
+class NtpClient:
+    """
+    NTP client class (query servers concurrently with asyncio)
+    """
+
+    def __init__(
+        self,
+        samples: int = NTP_SAMPLES,
+        deadline: float = NTP_DEADLINE,
+        port: int = 123,
+    ) -> None:
+        self._samples = samples
+        self._deadline = deadline
+        self._port = port
+
+    @staticmethod
+    def decode(
+        data: bytes,
+        transmit: int,
+        receive_time: float,
+    ) -> Tuple[float, float, str]:
+        """
+        Return (offset, delay, ref_id) from server reply or None.
+        """
+        if len(data) < 48 or data[0] & 0x7 != 4 or not 0 < data[1] < 16:
+            return None  # Not server reply or kiss-o'-death
+        originate, receive, reply = struct.unpack('!3Q', data[24:48])
+        if originate != transmit:
+            return None
+        time1 = transmit / 2**32 - NTP_DELTA
+        time2 = receive / 2**32 - NTP_DELTA
+        time3 = reply / 2**32 - NTP_DELTA
+        offset = ((time2 - time1) + (time3 - receive_time)) / 2
+        delay = (receive_time - time1) - (time3 - time2)
+        if data[1] == 1:
+            ref_id = data[12:16].decode('ascii', 'replace').strip('\0 ')
+        else:
+            ref_id = socket.inet_ntoa(data[12:16])
+        return offset, delay, ref_id
+
+    async def _sample(
+        self,
+        transport: asyncio.DatagramTransport,
+        protocol: NtpProtocol,
+    ) -> Tuple[float, float, str]:
+        transmit = int((time.time() + NTP_DELTA) * 2**32)
+        transport.sendto(struct.pack('!B39xQ', 0x1b, transmit))  # NTPv3
+        while True:
+            data, receive_time = await protocol.receive()
+            if not data:
+                return None
+            sample = self.decode(data, transmit, receive_time)
+            if sample:
+                return sample
+
+    async def _query(
+        self,
+        address: str,
+        samples: List[Tuple[float, float, str]],
+        deadline: float,
+        replied: asyncio.Event,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            transport, protocol = await loop.create_datagram_endpoint(
+                NtpProtocol,
+                remote_addr=(address, self._port),
+            )
+        except OSError:
+            replied.set()
+            return
+        try:
+            for _ in range(self._samples):
+                start = loop.time()
+                timeout = min(NTP_TIMEOUT, deadline - start)
+                if timeout <= 0:
+                    break
+                try:
+                    sample = await asyncio.wait_for(
+                        self._sample(transport, protocol),  # type: ignore
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    continue
+                if sample:
+                    samples.append(sample)
+                    replied.set()
+                await asyncio.sleep(min(
+                    start + NTP_INTERVAL - loop.time(),
+                    deadline - loop.time(),
+                ))
+        finally:
+            transport.close()
+            replied.set()
+
+    async def _query_all(self, addresses: List[str]) -> Dict[str, list]:
+        deadline = asyncio.get_running_loop().time() + self._deadline
+        results: Dict[str, list] = {address: [] for address in addresses}
+        replied = asyncio.Event()
+        tasks = {
+            address: asyncio.ensure_future(
+                self._query(address, results[address], deadline, replied),
+            )
+            for address in addresses
+        }
+        try:  # Stop when all servers replied (more samples while waiting)
+            while not all(
+                results[address] or task.done()
+                for address, task in tasks.items()
+            ):
+                await replied.wait()
+                replied.clear()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return results
+
+    def query(self, addresses: List[str]) -> Dict[str, list]:
+        """
+        Return (offset, delay, ref_id) samples for each server address.
+        """
+        return asyncio.run(self._query_all(addresses))
+
+
 class Main:
     """
     Main class
@@ -132,57 +291,64 @@ class Main:
         return 60
 
     @staticmethod
-    def get_server() -> Generator[str, None, None]:
+    def get_servers() -> List[str]:
         """
-        Return NTP server IP address
+        Return NTP server IP addresses
         """
         client = dns.resolver.Resolver(configure=False)
         client.nameservers = DNS_SERVERS
-        while True:
-            try:
-                for answer in client.resolve(NTP_SERVER, 'A'):
-                    yield answer.to_text()
-            except dns.exception.DNSException:
-                yield 'none'
-
-    @classmethod
-    def get_offset(cls) -> float:
-        """
-        Determine NTP offset
-        """
-        client = ntplib.NTPClient()
-        offsets = []
-        logger.info("Connecting to NTP server...")
-        for _ in range(NTP_SYNC_MAX):
-            try:
-                response = client.request(next(cls.get_server()), version=3)
-            except (socket.gaierror, ntplib.NTPException):
-                logger.info("Offset:    ?.?????????  (???.???.???.???)")
-            else:
+        try:
+            return [
+                answer.to_text()
+                for answer in client.resolve(NTP_SERVER, 'A')
+            ][:NTP_SYNC_MAX]
+        except dns.exception.DNSException:
+            return []
+
+    @staticmethod
+    def get_offset(addresses: List[str], port: int = 123) -> float:
+        """
+        Determine NTP offset (lowest delay sample after rejecting outliers)
+        """
+        logger.info("Connecting to NTP servers...")
+        results = NtpClient(port=port).query(addresses)
+
+        best = []
+        for address, samples in results.items():
+            if samples:
+                offset, delay, ref_id = min(samples, key=lambda x: x[1])
                 logger.info(
-                    "Offset:   %12.9f  (%s)",
-                    response.offset,
-                    ntplib.ref_id_to_text(response.ref_id),
+                    "Offset:   %12.9f  %.6f  (%s %s)",
+                    offset,
+                    delay,
+                    address,
+                    ref_id,
                 )
-                offsets.append(response.offset)
-
-        if len(offsets) >= NTP_SYNC_MIN:
-            mean = statistics.mean(offsets)
-            stddev = statistics.pstdev(offsets)
-            offsets = [
+                best.append((offset, delay))
+            else:
+                logger.info("Offset:    ?.?????????  (%s)", address)
+
+        if len(best) >= NTP_SYNC_MIN:
+            median = statistics.median(x[0] for x in best)
+            limit = max(
+                3 * statistics.median(abs(x[0] - median) for x in best),
+                NTP_OUTLIER,
+            )
+            good = [
                 x
-                for x in offsets
-                if math.isclose(mean, x, abs_tol=2*stddev)
+                for x in best
+                if math.isclose(x[0], median, abs_tol=limit)
             ]
-            if len(offsets) > NTP_SYNC_MIN:
+            if len(good) >= NTP_SYNC_MIN:
+                offsets = [x[0] for x in good]
                 if math.isclose(min(offsets), max(offsets), abs_tol=60.):
-                    average = statistics.mean(offsets)
+                    offset = min(good, key=lambda x: x[1])[0]
                     logger.info(
-                        "Average:  %12.9f  (%d rejected)",
-                        average,
-                        NTP_SYNC_MAX - len(offsets),
+                        "Selected: %12.9f  (%d rejected)",
+                        offset,
+                        len(best) - len(good),
                     )
-                    return average
+                    return offset
                 logger.error("Unstable: offset range is over a minute")
         return None
 
@@ -211,7 +377,7 @@ class Main:
 
         options = Options()
         if not options.get_update_flag():
-            self.get_offset()
+            self.get_offset(self.get_servers())
             return 0
 
         self._date = Command('date', errors='stop')
@@ -219,7 +385,7 @@ class Main:
         delay = self.check_clock()
 
         while True:
-            offset = self.get_offset()
+            offset = self.get_offset(self.get_servers())
             if offset:
                 self.set_clock(offset)
                 if options.get_repeat_flag():
@@ -5,23 +5,140 @@ Python sub task handling module
 Copyright GPL v2: 2006-2026 By Dr Colin Kong
 """
 
+import asyncio
 import copy
+import json
 import os
+import queue
 import re
+import selectors
 import signal
 import subprocess
 import sys
+import threading
+import time
 import types
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Union
+from typing import Any, Callable, Dict, Generator, List, Tuple, Union
 
 from command_mod import Command
 
-RELEASE = '2.4.2'
-VERSION = 20260628
+RELEASE = '2.7.2'
+VERSION = 20261019
 
 BUFFER_SIZE = 131072
 
+# pylint: disable=too-many-lines
+
+
+class Trace:
+    """
+    This class records sub process usage as JSON lines if
+    "SUBTASK_MOD_TRACE" environment variable is set to trace file.
+    """
+
+    @staticmethod
+    def get_file() -> str:
+        """
+        Return trace file or blank if tracing disabled.
+        """
+        return os.environ.get('SUBTASK_MOD_TRACE', '')
+
+    @staticmethod
+    def _get_program(cmdline: List[str]) -> str:
+        """
+        Return program name (script name if run by Python interpreter).
+        """
+        if cmdline[0] == sys.executable:
+            for arg in cmdline[1:]:
+                if arg == '-c':
+                    break
+                if not arg.startswith('-') and arg != __file__:
+                    return Path(arg).name
+        return Path(cmdline[0]).name
+
+    @staticmethod
+    def _get_exitcode(status: int) -> int:
+        """
+        Return exit code from wait status (negative signal if killed).
+        """
+        if hasattr(os, 'waitstatus_to_exitcode'):  # Python >= 3.9
+            return os.waitstatus_to_exitcode(status)
+        if os.WIFEXITED(status):
+            return os.WEXITSTATUS(status)
+        return -os.WTERMSIG(status)
+
+    @classmethod
+    def write(cls, cmdline: List[str], mode: str, **kwargs: Any) -> None:
+        """
+        Append trace record to trace file.
+
+        start = Start time from time.monotonic()
+        exitcode = Exit status
+        nbytes = Number of bytes captured from stdout and stderr
+        rusage = Child resource usage from os.wait4()
+        """
+        start = kwargs.get('start')
+        rusage = kwargs.get('rusage')
+        record = {
+            'time': round(time.time(), 3),
+            'pid': os.getpid(),
+            'mode': mode,
+            'argv0': cmdline[0],
+            'program': cls._get_program(cmdline),
+            'wall': (
+                round(time.monotonic() - start, 6) if start else None
+            ),
+            'user': round(rusage.ru_utime, 6) if rusage else None,
+            'sys': round(rusage.ru_stime, 6) if rusage else None,
+            'maxrss': (  # KB (macOS reports bytes)
+                rusage.ru_maxrss // (1024 if sys.platform == 'darwin' else 1)
+                if rusage else None
+            ),
+            'exitcode': kwargs.get('exitcode'),
+            'bytes': kwargs.get('nbytes'),
+        }
+        try:
+            file = os.open(
+                cls.get_file(),
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                0o644,
+            )
+            try:  # Single write for concurrent appends
+                os.write(file, f'{json.dumps(record)}\n'.encode())
+            finally:
+                os.close(file)
+        except OSError:
+            pass
+
+    @classmethod
+    def wait(
+        cls,
+        child: subprocess.Popen,
+        cmdline: List[str],
+        mode: str,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Wait for child process and return exit status (traced if enabled).
+
+        start = Start time from time.monotonic()
+        nbytes = Number of bytes captured from stdout and stderr
+        """
+        if not cls.get_file():
+            return child.wait()
+
+        rusage = None
+        if hasattr(os, 'wait4') and child.returncode is None:
+            try:
+                _, status, rusage = os.wait4(child.pid, 0)
+                child.returncode = cls._get_exitcode(status)
+            except ChildProcessError:
+                pass
+        exitcode = child.wait()
+        cls.write(cmdline, mode, exitcode=exitcode, rusage=rusage, **kwargs)
+        return exitcode
+
 
 class Task:
     """
@@ -43,7 +160,12 @@ class Task:
                         self._cmdline = [sys.executable, '-B'] + cmdline
             except OSError:
                 pass
-        self._status: dict = {'output': [], 'error': [], 'exitcode': 0}
+        self._status: dict = {
+            'output': [],
+            'error': [],
+            'exitcode': 0,
+            'bytes': 0,
+        }
 
     def get_cmdline(self) -> List[str]:
         """
@@ -172,34 +294,130 @@ class Task:
         child.stdin.close()
 
     @staticmethod
-    def _recv_stdout(child: subprocess.Popen, info: dict) -> None:
-        ismatch = re.compile(info['pattern']) if info['pattern'] else None
-        replace = info['replace']
+    def _read_pipes_threads(
+        pipes: List[Tuple[bool, Any]],
+    ) -> Generator[Tuple[bool, bytes], None, None]:
+        chunks: queue.Queue = queue.Queue()
 
-        while True:
-            try:
-                line = child.stdout.readline().decode(errors='replace')
-            except (KeyboardInterrupt, OSError):
-                break
-            if not line:
-                break
-            if not ismatch or not ismatch.search(line):
-                sys.stdout.write(line.replace(replace[0], replace[1]))
+        def _read(is_error: bool, pipe: Any) -> None:
+            while True:
+                try:
+                    chunk = pipe.read1(BUFFER_SIZE)
+                except (OSError, ValueError):
+                    chunk = b''
+                chunks.put((is_error, chunk))
+                if not chunk:
+                    break
+
+        for is_error, pipe in pipes:
+            threading.Thread(target=_read, args=(is_error, pipe)).start()
+        active = len(pipes)
+        while active:
+            is_error, chunk = chunks.get()
+            if not chunk:
+                active -= 1
+            yield is_error, chunk
+
+    def _read_pipes(
+        self,
+        child: subprocess.Popen,
+    ) -> Generator[Tuple[bool, bytes], None, None]:
+        """
+        Yield (is_error, chunk) as data arrives on stdout and stderr.
+        Empty chunk is returned for end of stream.
+        """
+        self._status['bytes'] = 0
+        pipes = [(False, child.stdout)]
+        if child.stderr:
+            pipes.append((True, child.stderr))
+
+        if os.name == 'nt':  # Windows select does not support pipes
+            for is_error, chunk in self._read_pipes_threads(pipes):
+                self._status['bytes'] += len(chunk)
+                yield is_error, chunk
+            return
+
+        with selectors.DefaultSelector() as selector:
+            for is_error, pipe in pipes:
+                selector.register(pipe, selectors.EVENT_READ, is_error)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    try:
+                        chunk = os.read(key.fd, BUFFER_SIZE)
+                    except OSError:
+                        chunk = b''
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                    self._status['bytes'] += len(chunk)
+                    yield key.data, chunk
 
     @staticmethod
-    def _recv_stderr(child: subprocess.Popen, info: dict) -> None:
+    def _split_lines(pending: List[bytes], chunk: bytes) -> List[str]:
+        """
+        Return complete lines in chunk with any pending partial line.
+        Empty chunk returns last partial line.
+        """
+        if not chunk:
+            data = b''.join(pending)
+            pending.clear()
+            return [data.decode(errors='replace')] if data else []
+
+        end = chunk.rfind(b'\n')
+        if end < 0:
+            pending.append(chunk)
+            return []
+        data = b''.join(pending + [chunk[:end]]) if pending else chunk[:end]
+        pending.clear()
+        if end + 1 < len(chunk):
+            pending.append(chunk[end+1:])
+        return data.decode(errors='replace').split('\n')
+
+    def _read_lines(
+        self,
+        child: subprocess.Popen,
+    ) -> Generator[Tuple[bool, List[str]], None, None]:
+        """
+        Yield (is_error, lines) as lines arrive on stdout and stderr.
+        """
+        pending: Dict[bool, List[bytes]] = {False: [], True: []}
+        for is_error, chunk in self._read_pipes(child):
+            lines = self._split_lines(pending[is_error], chunk)
+            if lines:
+                yield is_error, lines
+
+    def _interactive_child_run(self, cmdline: List[str], info: dict) -> int:
+        start = time.monotonic()
+        child: subprocess.Popen = self._start_child(cmdline, info)
         ismatch = re.compile(info['pattern']) if info['pattern'] else None
-        replace = info['replace']
+        replace = info['replace'] if info['replace'] else ('', '')
 
-        while True:
-            try:
-                line = child.stderr.readline().decode(errors='replace')
-            except (KeyboardInterrupt, OSError):
-                break
-            if not line:
-                break
-            if not ismatch or not ismatch.search(line):
-                sys.stderr.write(line.replace(replace[0], replace[1]))
+        if info['stdin']:
+            self._send_stdin(child, info)
+        try:
+            for is_error, lines in self._read_lines(child):
+                if ismatch:
+                    lines = [x for x in lines if not ismatch.search(x)]
+                if not lines:
+                    continue
+                text = '\n'.join(lines) + '\n'
+                if replace[0]:
+                    text = text.replace(replace[0], replace[1])
+                try:
+                    (sys.stderr if is_error else sys.stdout).write(text)
+                except OSError as exception:
+                    stream = 'stderr' if is_error else 'output'
+                    raise OutputWriteError(
+                        f'Error writing {stream} of "{self._file}" program.',
+                    ) from exception
+        except KeyboardInterrupt:
+            pass
+        return Trace.wait(
+            child,
+            cmdline,
+            'task',
+            start=start,
+            nbytes=self._status['bytes'],
+        )
 
     @staticmethod
     def _interactive_run(cmdline: List[str], info: dict) -> int:
@@ -211,8 +429,18 @@ class Task:
         else:
             pipe = False
 
+        start = time.monotonic()
         try:
-            return subprocess.call(command, env=info['env'], shell=pipe)
+            with subprocess.Popen(
+                command,
+                env=info['env'],
+                shell=pipe,
+            ) as child:
+                try:
+                    return Trace.wait(child, cmdline, 'task', start=start)
+                except KeyboardInterrupt:
+                    child.kill()
+                    raise
         except KeyboardInterrupt:
             return 130
 
@@ -236,28 +464,6 @@ class Task:
             stderr=stderr
         )
 
-    def _interactive_child_run(self, cmdline: List[str], info: dict) -> int:
-        child: subprocess.Popen = self._start_child(cmdline, info)
-        if not info['replace']:
-            info['replace'] = ('', '')
-
-        if info['stdin']:
-            self._send_stdin(child, info)
-        try:
-            self._recv_stdout(child, info)
-        except OSError as exception:
-            raise OutputWriteError(
-                f'Error writing stderr of "{self._file}" program.',
-            ) from exception
-        if not info['error2output']:
-            try:
-                self._recv_stderr(child, info)
-            except OSError as exception:
-                raise OutputWriteError(
-                    f'Error  writing output of "{self._file}" program.',
-                ) from exception
-        return child.wait()
-
     def run(self, **kwargs: Any) -> Any:
         """
         Run process interactively and return exits status.
@@ -324,6 +530,8 @@ class Background(Task):
         else:
             pipe = False
 
+        if Trace.get_file():
+            Trace.write(cmdline, 'background')
         if info['pattern']:
             os.environ['_SUBTASK_MOD_BACKGROUND_FILTER'] = info['pattern']
             subprocess.Popen(  # pylint: disable=consider-using-with
@@ -375,20 +583,33 @@ class Batch(Task):
     This class handles running sub process in batch mode.
     """
 
-    @staticmethod
-    def _write_file(child: subprocess.Popen, path: Path, append: bool) -> None:
-        mode = 'ab' if append else 'wb'
+    def _batch_read(self, child: subprocess.Popen, info: dict) -> None:
+        ismatch = re.compile(info['pattern']) if info['pattern'] else None
+        for is_error, lines in self._read_lines(child):
+            if ismatch:
+                lines = [x for x in lines if ismatch.search(x)]
+            self._status['error' if is_error else 'output'].extend(lines)
+
+    def _batch_write(
+        self,
+        child: subprocess.Popen,
+        info: dict,
+        path: Path,
+    ) -> None:
+        ismatch = re.compile(info['pattern']) if info['pattern'] else None
+        pending: List[bytes] = []
         try:
-            with path.open(mode) as ofile:
-                while True:
-                    chunk = child.stdout.read(4096)
-                    if not chunk:
-                        break
-                    ofile.write(chunk)
-        except KeyboardInterrupt:
-            pass
+            with path.open('ab' if info['append'] else 'wb') as ofile:
+                for is_error, chunk in self._read_pipes(child):
+                    if not is_error:
+                        ofile.write(chunk)
+                        continue
+                    lines = self._split_lines(pending, chunk)
+                    if ismatch:
+                        lines = [x for x in lines if ismatch.search(x)]
+                    self._status['error'].extend(lines)
         except OSError as exception:
-            if append:
+            if info['append']:
                 raise OutputWriteError(
                     f'Cannot append to "{path}" output file.',
                 ) from exception
@@ -397,35 +618,25 @@ class Batch(Task):
             ) from exception
 
     def _batch_run(self, cmdline: List[str], info: dict) -> int:
+        start = time.monotonic()
         child = self._start_child(cmdline, info)
         if info['stdin']:
             self._send_stdin(child, info)
 
-        ismatch = re.compile(info['pattern'])
-        file = info['file']
-        if file:
-            self._write_file(child, Path(file), info['append'])
-        else:
-            while True:
-                try:
-                    line = child.stdout.readline().decode(errors='replace')
-                except (KeyboardInterrupt, OSError):
-                    break
-                if not line:
-                    break
-                if ismatch.search(line):
-                    self._status['output'].append(line.rstrip('\n'))
-        if not info['error2output']:
-            while True:
-                try:
-                    line = child.stderr.readline().decode(errors='replace')
-                except (KeyboardInterrupt, OSError):
-                    break
-                if not line:
-                    break
-                if ismatch.search(line):
-                    self._status['error'].append(line.rstrip('\n'))
-        return child.wait()
+        try:
+            if info['file']:
+                self._batch_write(child, info, Path(info['file']))
+            else:
+                self._batch_read(child, info)
+        except KeyboardInterrupt:
+            pass
+        return Trace.wait(
+            child,
+            cmdline,
+            'batch',
+            start=start,
+            nbytes=self._status['bytes'],
+        )
 
     def run(self, **kwargs: Any) -> int:
         """
@@ -465,6 +676,233 @@ class Batch(Task):
 
         return self._status['exitcode']
 
+    def stream(self, **kwargs: Any) -> Generator[str, None, None]:
+        """
+        Run process in batch mode and yield stdout lines as they arrive.
+        The stderr lines and exit status are available at the end.
+
+        directory = Directory to run command in
+        env = Dictionary containing environmental variables to change
+        error2output = Flag to send stderr to stdout
+        pattern = Regular expression for selecting output
+        stdin = List of str for stdin input
+        """
+        self._status['output'] = []
+        self._status['error'] = []
+        info = self._parse_keys(
+            ('directory', 'env', 'error2output', 'pattern', 'stdin'),
+            **kwargs
+        )
+
+        if info['directory']:
+            pwd = os.getcwd()
+            os.chdir(info['directory'])
+        start = time.monotonic()
+        try:
+            child = self._start_child(self._cmdline, info)
+        except OSError as exception:
+            raise ExecutableCallError(
+                f'Error in calling "{self._file}" program.',
+            ) from exception
+        finally:
+            if info['directory']:
+                os.chdir(pwd)
+        if info['stdin']:
+            self._send_stdin(child, info)
+
+        ismatch = re.compile(info['pattern']) if info['pattern'] else None
+        try:
+            for is_error, lines in self._read_lines(child):
+                if ismatch:
+                    lines = [x for x in lines if ismatch.search(x)]
+                if is_error:
+                    self._status['error'].extend(lines)
+                else:
+                    yield from lines
+        finally:
+            child.stdout.close()
+            if child.stderr:
+                child.stderr.close()
+            self._status['exitcode'] = Trace.wait(
+                child,
+                self._cmdline,
+                'stream',
+                start=start,
+                nbytes=self._status['bytes'],
+            )
+
+    async def run_async(self, **kwargs: Any) -> int:
+        """
+        Run process in batch mode with asyncio and return exit status.
+
+        directory = Directory to run command in
+        env = Dictionary containing environmental variables to change
+        error2output = Flag to send stderr to stdout
+        pattern = Regular expression for selecting output
+        stdin = List of str for stdin input
+        timeout = Seconds before killing process (keeps output so far)
+        """
+        self._status['output'] = []
+        self._status['error'] = []
+        info = self._parse_keys((
+            'directory',
+            'env',
+            'error2output',
+            'pattern',
+            'stdin',
+            'timeout',
+        ), **kwargs)
+
+        start = time.monotonic()
+        pipe = asyncio.subprocess.PIPE
+        options = {
+            'cwd': info['directory'] if info['directory'] else None,
+            'env': info['env'],
+            'stdin': pipe,
+            'stdout': pipe,
+            'stderr': (
+                asyncio.subprocess.STDOUT if info['error2output'] else pipe
+            ),
+        }
+        try:
+            if '|' in self._cmdline:
+                child = await asyncio.create_subprocess_shell(
+                    Command.args2cmd(self._cmdline),
+                    **options,
+                )
+            else:
+                child = await asyncio.create_subprocess_exec(
+                    *self._cmdline,
+                    **options,
+                )
+        except OSError as exception:
+            raise ExecutableCallError(
+                f'Error in calling "{self._file}" program.',
+            ) from exception
+
+        stdin = ''.join(f'{x}\n' for x in info['stdin'] or []).encode()
+        buffers = (bytearray(), bytearray())
+        try:
+            await asyncio.wait_for(
+                self._communicate(child, stdin, buffers),
+                info['timeout'],
+            )
+        except asyncio.TimeoutError:
+            child.kill()  # Keep output read before timeout
+        self._status['exitcode'] = await child.wait()
+        stdout, stderr = bytes(buffers[0]), bytes(buffers[1])
+        if Trace.get_file():
+            Trace.write(
+                self._cmdline,
+                'async',
+                start=start,
+                exitcode=self._status['exitcode'],
+                nbytes=len(stdout) + len(stderr),
+            )
+
+        self._set_output(info['pattern'], stdout, stderr)
+
+        return self._status['exitcode']
+
+    @staticmethod
+    async def _communicate(
+        child: Any,
+        stdin: bytes,
+        buffers: Tuple[bytearray, bytearray],
+    ) -> None:
+        """
+        Send stdin and read stdout/stderr into buffers as data arrives.
+        """
+        async def _write() -> None:
+            try:
+                if stdin:
+                    child.stdin.write(stdin)
+                    await child.stdin.drain()
+                child.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        async def _read(
+            stream: asyncio.StreamReader,
+            buffer: bytearray,
+        ) -> None:
+            while stream:
+                chunk = await stream.read(65536)
+                if not chunk:
+                    break
+                buffer.extend(chunk)
+
+        await asyncio.gather(
+            _write(),
+            _read(child.stdout, buffers[0]),
+            _read(child.stderr, buffers[1]),
+        )
+
+    def _set_output(self, pattern: str, stdout: bytes, stderr: bytes) -> None:
+        ismatch = re.compile(pattern) if pattern else None
+        for key, data in (('output', stdout), ('error', stderr)):
+            if data:
+                pending: List[bytes] = []
+                lines = (
+                    self._split_lines(pending, data) +
+                    self._split_lines(pending, b'')
+                )
+                if ismatch:
+                    lines = [x for x in lines if ismatch.search(x)]
+                self._status[key] = lines
+
+
+class BatchPool:
+    """
+    This class runs many sub processes concurrently in batch mode.
+    """
+
+    def __init__(self, threads: int = 0, timeout: float = None) -> None:
+        """
+        threads = Maximum concurrent processes (default CPU count)
+        timeout = Seconds before killing each process
+        """
+        self._threads = threads if threads > 0 else os.cpu_count() or 1
+        self._timeout = timeout
+        self._jobs: List[Tuple[Batch, dict]] = []
+
+    def get_tasks(self) -> List[Batch]:
+        """
+        Return list of tasks in order added.
+        """
+        return [task for task, _ in self._jobs]
+
+    def add(self, task: Batch, **kwargs: Any) -> Batch:
+        """
+        Add batch task to pool and return task.
+
+        kwargs = Batch.run_async() keywords (ie pattern, stdin)
+        """
+        if self._timeout and 'timeout' not in kwargs:
+            kwargs['timeout'] = self._timeout
+        self._jobs.append((task, kwargs))
+        return task
+
+    async def _run(self) -> List[int]:
+        semaphore = asyncio.Semaphore(self._threads)
+
+        async def _run_job(task: Batch, kwargs: dict) -> int:
+            async with semaphore:
+                return await task.run_async(**kwargs)
+
+        return list(await asyncio.gather(*[
+            _run_job(task, kwargs) for task, kwargs in self._jobs
+        ]))
+
+    def run(self) -> List[int]:
+        """
+        Run all tasks and return list of exit status in order added.
+        Task output is available from each task.
+        """
+        if not self._jobs:
+            return []
+        return asyncio.run(self._run())
+
 
 class Child(Task):
     """
@@ -484,6 +922,8 @@ class Child(Task):
         if info['directory']:
             pwd = Path.cwd()
             os.chdir(info['directory'])
+        if Trace.get_file():
+            Trace.write(self._cmdline, 'child')
         try:
             return self._start_child(self._cmdline, info)
         except OSError as exception:
@@ -501,6 +941,8 @@ class Daemon(Task):
 
     @staticmethod
     def _start_daemon(cmdline: List[str], info: dict) -> None:
+        if Trace.get_file():
+            Trace.write(cmdline, 'daemon')
         os.environ['_SUBTASK_MOD_DAEMON_FILE'] = str(info['file'])
 
         if '|' in cmdline:
@@ -579,6 +1021,8 @@ class Exec(Task):
         if '|' in cmdline:
             raise PipeNotSupportedError('Exec does not support pipe.')
 
+        if Trace.get_file():
+            Trace.write(cmdline, 'exec')
         if os.name == 'nt':  # Avoids Windows execvpn exit status bug
             cls._windows_exec_run(cmdline, info)
         else:
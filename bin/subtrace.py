@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Report sub process usage from "SUBTASK_MOD_TRACE" trace files.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+from pathlib import Path
+from typing import List
+
+SORT_KEYS = {
+    'bytes': 'bytes',
+    'calls': 'calls',
+    'cpu': 'cpu',
+    'rss': 'maxrss',
+    'wall': 'wall',
+}
+
+
+class Options:
+    """
+    Options class
+    """
+
+    def __init__(self) -> None:
+        self._args: argparse.Namespace = None
+        self.parse(sys.argv)
+
+    def get_files(self) -> List[str]:
+        """
+        Return list of trace files.
+        """
+        return self._args.files
+
+    def get_lines(self) -> int:
+        """
+        Return number of lines.
+        """
+        return self._args.lines[0]
+
+    def get_sort(self) -> str:
+        """
+        Return sort key.
+        """
+        return SORT_KEYS[self._args.sort[0]]
+
+    def _parse_args(self, args: List[str]) -> None:
+        parser = argparse.ArgumentParser(
+            description="Report sub process usage from trace files. "
+            'Set "SUBTASK_MOD_TRACE=file.jsonl" when running '
+            "programs to record trace.",
+        )
+
+        parser.add_argument(
+            '-n',
+            nargs=1,
+            type=int,
+            dest='lines',
+            default=[20],
+            metavar='K',
+            help="Output first K programs (default 20).",
+        )
+        parser.add_argument(
+            '-sort',
+            nargs=1,
+            dest='sort',
+            default=['wall'],
+            choices=sorted(SORT_KEYS),
+            help="Sort order (default wall).",
+        )
+        parser.add_argument(
+            'files',
+            nargs='+',
+            metavar='file.jsonl',
+            help="Trace file.",
+        )
+
+        self._args = parser.parse_args(args)
+
+    def parse(self, args: List[str]) -> None:
+        """
+        Parse arguments
+        """
+        self._parse_args(args[1:])
+
+
+class Main:
+    """
+    Main class
+    """
+
+    def __init__(self) -> None:
+        try:
+            self.config()
+            sys.exit(self.run())
+        except (EOFError, KeyboardInterrupt):
+            sys.exit(114)
+        except SystemExit as exception:
+            sys.exit(exception)  # type: ignore
+
+    @staticmethod
+    def config() -> None:
+        """
+        Configure program
+        """
+        if hasattr(signal, 'SIGPIPE'):
+            signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+        if os.linesep != '\n':
+            def _open(file, *args, **kwargs):  # type: ignore
+                if 'newline' not in kwargs and args and 'b' not in args[0]:
+                    kwargs['newline'] = '\n'
+                return open(str(file), *args, **kwargs)
+            Path.open = _open  # type: ignore
+
+    @staticmethod
+    def _read(path: Path, stats: dict) -> None:
+        try:
+            with path.open(errors='replace') as ifile:
+                for line in ifile:
+                    try:
+                        record = json.loads(line)
+                    except json.decoder.JSONDecodeError:
+                        continue
+                    stat = stats.setdefault(record['program'], {
+                        'calls': 0,
+                        'wall': 0.,
+                        'cpu': 0.,
+                        'maxrss': 0,
+                        'bytes': 0,
+                        'fails': 0,
+                    })
+                    stat['calls'] += 1
+                    stat['wall'] += record['wall'] or 0.
+                    stat['cpu'] += (record['user'] or 0.) + (
+                        record['sys'] or 0.)
+                    stat['maxrss'] = max(
+                        stat['maxrss'],
+                        record['maxrss'] or 0,
+                    )
+                    stat['bytes'] += record['bytes'] or 0
+                    if record['exitcode']:
+                        stat['fails'] += 1
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot read "{path}" trace file.',
+            ) from exception
+
+    @staticmethod
+    def _show(stats: dict, key: str, lines: int) -> None:
+        total = sum(x['wall'] for x in stats.values()) or 1.
+        print(
+            "Program                   Calls   Wall(s)  Wall%    CPU(s)  "
+            "MaxRSS(MB)    Bytes(MB)  Fails"
+        )
+        for program, stat in sorted(
+            stats.items(),
+            key=lambda x: (-x[1][key], x[0]),
+        )[:lines]:
+            print(
+                f"{program[:24]:24s} {stat['calls']:6d} "
+                f"{stat['wall']:9.3f} {stat['wall']*100/total:5.1f}% "
+                f"{stat['cpu']:9.3f} {stat['maxrss']/1024:11.1f} "
+                f"{stat['bytes']/1048576:12.3f} {stat['fails']:6d}"
+            )
+
+    @classmethod
+    def run(cls) -> int:
+        """
+        Start program
+        """
+        options = Options()
+
+        stats: dict = {}
+        for file in options.get_files():
+            cls._read(Path(file), stats)
+        cls._show(stats, options.get_sort(), options.get_lines())
+
+        return 0
+
+
+if __name__ == '__main__':
+    if '--pydoc' in sys.argv:
+        help(__name__)
+    else:
+        Main()
@@ -6,6 +6,7 @@ System information (configuration detection tool).
 """
 
 import argparse
+import concurrent.futures
 import functools
 import glob
 import ipaddress
@@ -20,19 +21,20 @@ import sys
 import threading
 import time
 from pathlib import Path
-from typing import Any, Generator, List, Tuple, Union
+from typing import Any, Callable, Generator, List, Tuple, Union
 
 from command_mod import Command, CommandFile, Platform
-from file_mod import FileStat, FileUtil
+from file_mod import FileError, FileStat, FileUtil
 from power_mod import Battery
-from subtask_mod import Batch, Child, ExecutableCallError
+from subtask_mod import Batch, BatchPool, Child, ExecutableCallError
 
 if os.name == 'nt':
     import winreg  # pylint: disable=import-error
 
-RELEASE = '7.1.0'
-VERSION = 20260715
+RELEASE = '7.3.0'
+VERSION = 20261019
 MYIP_URL = 'http://ifconfig.me'
+PROBE_TIMEOUT = 10
 
 # pylint: disable=too-many-lines
 
@@ -63,6 +65,12 @@ class Options:
         """
         return self._release_version
 
+    def get_json_flag(self) -> bool:
+        """
+        Return JSON flag.
+        """
+        return self._args.json_flag
+
     def get_short(self) -> str:
         """
         Return short mode.
@@ -93,6 +101,12 @@ class Options:
             dest='short',
             help="Show device summary only.",
         )
+        parser.add_argument(
+            '-json',
+            action='store_true',
+            dest='json_flag',
+            help="Show information in JSON format.",
+        )
         parser.add_argument(
             '-n',
             action='store_const',
@@ -159,6 +173,110 @@ class CommandThread(threading.Thread):
         return self._stdout
 
 
+class ProbeThread(threading.Thread):
+    """
+    Probe thread class
+    """
+
+    def __init__(
+        self,
+        function: Callable,
+        *args: Any,
+        timeout: float = PROBE_TIMEOUT,
+    ) -> None:
+        threading.Thread.__init__(self, daemon=True)
+        self._function = function
+        self._args = args
+        self._timeout = timeout
+        self._records: List[Tuple[str, dict]] = []
+        self._exception: Exception = None
+
+    def run(self) -> None:
+        """
+        Run thread
+        """
+        try:
+            Writer.capture(self._records, self._function, *self._args)
+        except Exception as exception:  # pylint: disable=broad-except
+            self._exception = exception
+
+    def get_name(self) -> str:
+        """
+        Return probe name.
+        """
+        return self._function.__name__.strip('_')
+
+    def get_records(self) -> List[Tuple[str, dict]]:
+        """
+        Return output records (re-raise probe exception).
+        """
+        if self._exception:
+            raise self._exception
+        return list(self._records)
+
+    def get_timeout(self) -> float:
+        """
+        Return timeout in seconds.
+        """
+        return self._timeout
+
+
+class StaticCache:
+    """
+    Static information cache class (valid until reboot)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._path: Path = None
+        self._data: dict = {}
+        try:
+            boot_id = Path('/proc/sys/kernel/random/boot_id').read_text(
+                errors='replace',
+            ).strip()
+            self._path = Path(
+                FileUtil.tmpdir(Path('.cache', 'sysinfo')),
+                'static.json',
+            )
+        except (FileError, OSError):
+            return
+        self._key = f'{boot_id} {RELEASE}'
+        try:
+            with self._path.open(errors='replace') as ifile:
+                data = json.load(ifile)
+            if data.get('key') == self._key:
+                self._data = data
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def get(self, name: str, function: Callable) -> Any:
+        """
+        Return cached value or call function and cache result.
+        """
+        with self._lock:
+            if name in self._data:
+                return self._data[name]
+        value = function()
+        if self._path:
+            with self._lock:
+                self._data['key'] = self._key
+                self._data[name] = value
+                self.write()
+        return value
+
+    def write(self) -> None:
+        """
+        Write cache file.
+        """
+        path_tmp = Path(f'{self._path}.part-{os.getpid()}')
+        try:
+            with path_tmp.open('w') as ofile:
+                json.dump(self._data, ofile, ensure_ascii=False)
+            path_tmp.replace(self._path)
+        except OSError:
+            path_tmp.unlink(missing_ok=True)
+
+
 class Detect:
     """
     Detect class
@@ -217,18 +335,24 @@ class Detect:
 
         curl = Command('curl', errors='ignore')
         if curl.is_found():
-            curl.set_args(['--connect-timeout', '1'])
-            for ipv in ('ipv4', 'ipv6'):
-                task = Batch(curl.get_cmdline() + [f'--{ipv}', MYIP_URL])
-                task.run()
+            curl.set_args(['--connect-timeout', '1', '--max-time', '4'])
+            pool = BatchPool(threads=3)
+            tasks = [
+                (
+                    'Net IPvx Public',
+                    pool.add(Batch(curl.get_cmdline() + [arg, MYIP_URL])),
+                )
+                for arg in ('--ipv4', '--ipv6')
+            ] + [
+                ('Net Dflt Public', pool.add(Batch(
+                    curl.get_cmdline() + [MYIP_URL],
+                ))),
+            ]
+            pool.run()
+            for message, task in tasks:
                 for line in task.get_output():
-                    self._ip_address(line, 'Net IPvx Public')
+                    self._ip_address(line, message)
                     break
-            task = Batch(curl.get_cmdline() + [MYIP_URL])
-            task.run()
-            for line in task.get_output():
-                self._ip_address(line, 'Net Dflt Public')
-                break
 
     def _operating_system(self, short: str) -> None:
         info = self._system.get_os_info()
@@ -461,6 +585,12 @@ class Detect:
                 comment=comment,
             )
 
+    def get_author(self) -> str:
+        """
+        Return author.
+        """
+        return self._author
+
     def show_banner(self) -> None:
         """
         Show banner.
@@ -469,26 +599,45 @@ class Detect:
         print(f"\n{self._author} - System configuration detection tool")
         print(f"\n*** Detected at {timestamp} ***")
 
-    def show_info(self, short: str) -> None:
-        """
-        Show information.
-        """
+    def _get_probes(self, short: str) -> List[ProbeThread]:
+        probes = []
         if short in (None, 'net'):
-            self._network_information()
-        self._operating_system(short)
+            probes.append(ProbeThread(self._network_information, timeout=5))
+        probes.append(ProbeThread(self._operating_system, short))
         if short in (None, 'cpu'):
-            self._processors()
-        self._system_status(short)
+            probes.append(ProbeThread(self._processors))
+        probes.append(ProbeThread(self._system_status, short))
         if short in (None, 'dev') and self._system.has_devices():
-            self._system.detect_devices()
+            probes.append(ProbeThread(self._system.detect_devices))
         if self._system.has_loader():
             if not short:
-                self._system.detect_loader()
+                probes.append(ProbeThread(self._system.detect_loader))
             if short in (None, 'sys'):
-                self._system.detect_linker()
+                probes.append(ProbeThread(self._system.detect_linker))
         if not short:
-            self._xwindows()
-            self._software()
+            probes.append(ProbeThread(self._xwindows))
+            probes.append(ProbeThread(self._software))
+        return probes
+
+    def show_info(self, short: str) -> None:
+        """
+        Show information (probes run concurrently, output in order).
+        """
+        probes = self._get_probes(short)
+        start_time = time.time()
+        for probe in probes:
+            probe.start()
+
+        for probe in probes:
+            probe.join(max(start_time + probe.get_timeout() - time.time(), 0))
+            for name, kwargs in probe.get_records():
+                Writer.output(name, **kwargs)
+            if probe.is_alive():
+                Writer.output(
+                    name='Probe Timeout',
+                    value=probe.get_name(),
+                    comment=f'{probe.get_timeout()} seconds',
+                )
 
 
 class OperatingSystem:
@@ -808,9 +957,109 @@ class LinuxSystem(PosixSystem):
     Linux system class
     """
 
+    PCI_IDS = (
+        '/usr/share/misc/pci.ids',
+        '/usr/share/hwdata/pci.ids',
+        '/usr/share/pci.ids',
+    )
+
     def __init__(self) -> None:
+        self._cache = StaticCache()
+        self._devices: dict = self._cache.get('devices', self._scan_devices)
+        self._pci_index: dict = {}
+        for key, value in self._devices.items():
+            address = key.split()[0]
+            if address.count(':') == 1:  # lspci can miss "0000:"
+                address = f'0000:{address}'
+            self._pci_index[address] = (key.split(': ', 1)[-1], value)
+
+    def _scan_devices(self) -> dict:
+        self._devices = self._scan_sys_pci()
+        if not self._devices:
+            self._scan_lspci()
+        return self._devices
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _get_pci_ids(cls) -> dict:
+        names: dict = {}
+        for file in cls.PCI_IDS:
+            if not Path(file).is_file():
+                continue
+            vendor = pci_class = ''
+            for line in cls._read_file(file):
+                if line.startswith(('#', '\t\t')) or not line.strip():
+                    continue
+                if line.startswith('\t'):
+                    key, _, name = line.strip().partition(' ')
+                    if vendor:
+                        names[f'{vendor}:{key}'] = name.strip()
+                    elif pci_class:
+                        names[f'C{pci_class}:{key}'] = name.strip()
+                elif line.startswith('C '):
+                    vendor, pci_class = '', line[2:4]
+                    names[f'C{pci_class}'] = line[4:].strip()
+                else:
+                    vendor, pci_class = line[:4], ''
+                    names[vendor] = line[4:].strip()
+            break
+        return names
+
+    @classmethod
+    def _get_module_version(cls, module: str) -> str:
+        lines = cls._read_file('/sys/module', module, 'version')
+        if lines:
+            return lines[0]
+        if Path('/sys/module', module, 'initstate').exists():
+            return os.uname().release  # Same as "vermagic"
+        return ''
+
+    def _scan_sys_pci(self) -> dict:
+        names = self._get_pci_ids()
+        if not names or not Path('/sys/bus/pci/devices').is_dir():
+            return {}
+
+        devices = {}
+        modinfo = Command('modinfo', pathextra=['/sbin'], errors='ignore')
+        for path in sorted(Path('/sys/bus/pci/devices').iterdir()):
+            try:
+                vendor, device, pci_class, revision = [
+                    self._read_file(path, x)[0][2:]
+                    for x in ('vendor', 'device', 'class', 'revision')
+                ]
+            except IndexError:
+                continue
+            if f'{vendor}:{device}' in names:
+                model = f'{names[vendor]} {names[f"{vendor}:{device}"]}'
+            elif vendor in names:
+                model = f'{names[vendor]} Device {device}'
+            else:
+                model = f'Device {vendor}:{device}'
+            key = (
+                f"{path.name.replace('0000:', '', 1)} " +
+                names.get(
+                    f'C{pci_class[:2]}:{pci_class[2:4]}',
+                    names.get(f'C{pci_class[:2]}', f'Class {pci_class[:4]}'),
+                ) +
+                f': {model}' +
+                (f' rev {revision}' if revision != '00' else '')
+            ).replace('(', '').replace(')', '')
+            devices[key] = ''
+            if 'VGA compatible controller: ' in key:
+                devices[key] = self._scan_vga(key, key, modinfo)
+
+            driver = Path(path, 'driver')
+            if driver.is_dir():
+                version = self._get_module_version(
+                    Path(driver, 'module').resolve().name,
+                ) if Path(driver, 'module').exists() else ''
+                if version:
+                    devices[key] = f'{driver.resolve().name} driver {version}'
+
+        return devices
+
+    def _scan_lspci(self) -> None:
         device = None
-        self._devices: dict = {}
         lspci = Command(
             'lspci',
             pathextra=['/sbin'],
@@ -825,18 +1074,10 @@ class LinuxSystem(PosixSystem):
                 lspci.set_args([])
                 task = Batch(lspci.get_cmdline())
                 task.run()
+            drivers: dict = {}
             for line in task.get_output():
                 if 'Kernel driver in use:' in line:
-                    driver = line.split()[-1]
-                    if modinfo.is_found():
-                        task2 = Batch(modinfo.get_cmdline() + [driver])
-                        task2.run(pattern='^(version|vermagic):')
-                        if task2.has_output():
-                            self._devices[device] = (
-                                f'{driver} driver '
-                                f'{task2.get_output()[0].split()[1]}'
-                            )
-                            continue
+                    drivers[device] = line.split()[-1]
                 elif not line.startswith('\t'):
                     device = line.replace('(', '').replace(')', '')
                     if 'VGA compatible controller: ' in line:
@@ -844,6 +1085,23 @@ class LinuxSystem(PosixSystem):
                             line, device, modinfo)
                     else:
                         self._devices[device] = ''
+            if drivers and modinfo.is_found():
+                self._scan_drivers(drivers, modinfo)
+
+    def _scan_drivers(self, drivers: dict, modinfo: Command) -> None:
+        pool = BatchPool(threads=8, timeout=10)
+        tasks = {
+            driver: pool.add(
+                Batch(modinfo.get_cmdline() + [driver]),
+                pattern='^(version|vermagic):',
+            )
+            for driver in sorted(set(drivers.values()))
+        }
+        pool.run()
+        for device, driver in drivers.items():
+            if tasks[driver].has_output():
+                version = tasks[driver].get_output()[0].split()[1]
+                self._devices[device] = f'{driver} driver {version}'
 
     @classmethod
     def _scan_vga(cls, line: str, device: str, modinfo: Command) -> str:
@@ -1405,14 +1663,7 @@ class LinuxSystem(PosixSystem):
                 )
 
     def _match_pci(self, pci_id: str) -> Tuple[str, str]:
-        model = '???'
-        comment = ''
-        for key, value in self._devices.items():
-            if pci_id in f"0000:{key}":  # lspci can miss "0000:"
-                model = key.split(': ', 1)[-1]
-                comment = value
-                break
-        return model, comment
+        return self._pci_index.get(pci_id, ('???', ''))
 
     def detect_devices(self) -> None:
         """
@@ -1561,8 +1812,7 @@ class LinuxSystem(PosixSystem):
         dpkg = Command('dpkg', args=['--list'], errors='ignore')
         if dpkg.is_found():
             task = Batch(dpkg.get_cmdline())
-            task.run()
-            for line in task.get_output():
+            for line in task.stream():
                 try:
                     package = line.split()[1]
                     if package == 'knoppix-g':
@@ -1634,8 +1884,11 @@ class LinuxSystem(PosixSystem):
 
     def get_os_info(self) -> dict:
         """
-        Return operating system information dictionary.
+        Return operating system information dictionary (cached).
         """
+        return self._cache.get('os', self._get_os_info)
+
+    def _get_os_info(self) -> dict:
         info = super().get_os_info()
 
         for scan_method in (
@@ -1883,8 +2136,13 @@ class LinuxSystem(PosixSystem):
 
     def get_cpu_info(self) -> dict:
         """
-        Return CPU information dictionary.
+        Return CPU information dictionary (cached except clock).
         """
+        info = self._cache.get('cpu', self._get_cpu_info)
+        self._scan_frequency(info, self._read_file('/proc/cpuinfo'))
+        return info
+
+    def _get_cpu_info(self) -> dict:
         info = super().get_cpu_info()
 
         if info['CPU Addressability'] == 'Unknown':
@@ -2385,6 +2643,38 @@ class Writer:
     """
     Writer class
     """
+    _local = threading.local()
+    _records: List[dict] = None
+
+    @classmethod
+    def capture(
+        cls,
+        records: List[Tuple[str, dict]],
+        function: Callable,
+        *args: Any,
+    ) -> None:
+        """
+        Capture output records of function running in this thread.
+        """
+        cls._local.records = records
+        try:
+            function(*args)
+        finally:
+            cls._local.records = None
+
+    @classmethod
+    def set_json(cls) -> None:
+        """
+        Collect output records for JSON format.
+        """
+        cls._records = []
+
+    @classmethod
+    def get_json(cls) -> List[dict]:
+        """
+        Return collected output records.
+        """
+        return cls._records
 
     @staticmethod
     def dump(name: str, **kwargs: Any) -> None:
@@ -2394,11 +2684,16 @@ class Writer:
         info = {name: kwargs}
         print(json.dumps(info, ensure_ascii=False, indent=4, sort_keys=True))
 
-    @staticmethod
-    def output(name: str, **kwargs: Any) -> None:
+    @classmethod
+    def output(cls, name: str, **kwargs: Any) -> None:
         """
         Output information.
         """
+        records = getattr(cls._local, 'records', None)
+        if records is not None:
+            records.append((name, kwargs))
+            return
+
         line = f" {name + ':':19s}"
         if 'device' in kwargs and kwargs['device']:
             device = kwargs['device']
@@ -2407,6 +2702,13 @@ class Writer:
                 not Path(device).exists()
             ):
                 return
+        if cls._records is not None:
+            cls._records.append({'name': name, **{
+                key: value for key, value in kwargs.items() if value
+            }})
+            return
+
+        if 'device' in kwargs and kwargs['device']:
             line += f" {device:12s} {kwargs['value']}"
         elif 'location' in kwargs and kwargs['location']:
             line += f" {kwargs['location']}"
@@ -2555,10 +2857,10 @@ class Software:
         """
         Yield all software versions
         """
-        for software in self.SOFTWARE_TOOLS:
-            info = self.get(software)
-            if info:
-                yield info
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as pool:
+            for info in pool.map(self.get, self.SOFTWARE_TOOLS):
+                if info:
+                    yield info
 
 
 class Main:
@@ -2602,13 +2904,28 @@ class Main:
         short = options.get_short()
 
         detect = Detect(options)
-        if not short:
+        if options.get_json_flag():
+            Writer.set_json()
+        elif not short:
             detect.show_banner()
         try:
-            Detect(options).show_info(short)
+            detect.show_info(short)
         except ExecutableCallError as exception:
             raise SystemExit(exception) from exception
-        print()
+
+        if options.get_json_flag():
+            print(json.dumps(
+                {
+                    'author': detect.get_author(),
+                    'detected': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                    'info': Writer.get_json(),
+                },
+                default=str,
+                ensure_ascii=False,
+                indent=4,
+            ))
+        else:
+            print()
 
         return 0
 
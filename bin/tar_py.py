@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """
-Make optional compressed archive in TAR/TAR.GZ/TAR.BZ2/TAR.XZ/TGZ/TBZ/TXZ
-format (Python version).
+Make optional compressed archive in
+TAR/TAR.GZ/TAR.BZ2/TAR.XZ/TAR.ZST/TGZ/TBZ/TXZ/TZST format (Python version).
 """
 
 import argparse
+import bz2
+import collections
+import concurrent.futures
+import functools
+import gzip
+import lzma
 import os
 import signal
 import sys
 import tarfile
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+import pyzstd  # type: ignore
 
 
 class Options:
@@ -34,12 +42,26 @@ class Options:
         """
         return self._files
 
+    def get_threads(self) -> int:
+        """
+        Return number of threads.
+        """
+        return self._args.threads[0]
+
     def _parse_args(self, args: List[str]) -> None:
         parser = argparse.ArgumentParser(
             description="Make a compressed archive in "
-            "TAR/TAR.GZ/TAR.BZ2/TAR.XZ (TGZ/TBZ/TXZ) format.",
+            "TAR/TAR.GZ/TAR.BZ2/TAR.XZ/TAR.ZST (TGZ/TBZ/TXZ/TZST) format.",
         )
 
+        parser.add_argument(
+            '-threads',
+            nargs=1,
+            type=int,
+            default=[os.cpu_count() or 1],
+            help="Number of compression threads. Default is number of "
+            "CPU cores.",
+        )
         parser.add_argument(
             'archive',
             nargs=1,
@@ -55,6 +77,12 @@ class Options:
 
         self._args = parser.parse_args(args)
 
+        if self._args.threads[0] < 1:
+            raise SystemExit(
+                f'{sys.argv[0]}: You must specific a positive integer '
+                'for threads.',
+            )
+
     def parse(self, args: List[str]) -> None:
         """
         Parse arguments
@@ -70,6 +98,58 @@ class Options:
         self._files = self._args.files if self._args.files else os.listdir()
 
 
+class ParallelWriter:
+    """
+    Parallel block compressor file object.
+
+    Blocks are compressed independently and written as concatenated
+    streams (readable by gzip, bzip2 and xz tools).
+    """
+
+    def __init__(
+        self,
+        ofile: BinaryIO,
+        compress: Callable[[bytes], bytes],
+        block_size: int,
+        threads: int,
+    ) -> None:
+        self._ofile = ofile
+        self._compress = compress
+        self._block_size = block_size
+        self._buffer = bytearray()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=threads,
+        )
+        self._pending: collections.deque = collections.deque()
+        self._max_pending = threads * 2
+
+    def _submit(self, block: bytes) -> None:
+        self._pending.append(self._executor.submit(self._compress, block))
+        while len(self._pending) > self._max_pending:
+            self._ofile.write(self._pending.popleft().result())
+
+    def write(self, data: bytes) -> int:
+        """
+        Write data.
+        """
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[:self._block_size]))
+            del self._buffer[:self._block_size]
+        return len(data)
+
+    def close(self) -> None:
+        """
+        Flush remaining blocks.
+        """
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self._ofile.write(self._pending.popleft().result())
+        self._executor.shutdown()
+
+
 class Main:
     """
     Main class
@@ -122,32 +202,77 @@ class Main:
                         f'{sys.argv[0]}: Cannot open "{path}" directory.',
                     ) from exception
 
+    @staticmethod
+    def _get_compressor(
+        archive: str,
+    ) -> Tuple[str, Optional[Callable[[bytes], bytes]], int]:
+        """
+        Return (tarfile mode, block compressor, block size).
+        """
+        if archive.endswith(('.tar.xz', '.txz', )):
+            return 'w:xz', functools.partial(lzma.compress, preset=6), 25165824
+        if archive.endswith(('.tar.bz2', '.tbz', )):
+            return 'w:bz2', functools.partial(
+                bz2.compress,
+                compresslevel=9,
+            ), 4194304
+        if archive.endswith(('.tar.gz', '.tgz', )):
+            return 'w:gz', functools.partial(gzip.compress, mtime=0), 4194304
+        if archive.endswith(('.tar.zst', '.tar.zstd', '.tzs', '.tzst')):
+            return 'zst', None, 0
+        if archive.endswith('.tar'):
+            return 'w', None, 0
+        raise SystemExit(
+            f'{sys.argv[0]}: Unsupported "{archive}" archive format.'
+        )
+
+    def _create(self, archive: str, path_tmp: Path) -> None:
+        mode, compress, block_size = self._get_compressor(archive)
+        paths = [Path(x) for x in self._options.get_files()]
+        threads = self._options.get_threads()
+
+        if mode == 'zst':
+            with pyzstd.ZstdFile(  # pylint: disable=no-member
+                path_tmp,
+                'w',
+                level_or_option={
+                    pyzstd.CParameter.compressionLevel: 3,
+                    pyzstd.CParameter.nbWorkers: threads,
+                    pyzstd.CParameter.checksumFlag: 1,
+                },
+            ) as zstd_file:
+                with tarfile.open(fileobj=zstd_file, mode='w|') as ofile:
+                    self._addfile(ofile, paths)
+        elif compress and threads > 1:
+            with path_tmp.open('wb') as raw_file:
+                writer = ParallelWriter(
+                    raw_file,
+                    compress,
+                    block_size,
+                    threads,
+                )
+                with tarfile.open(
+                    fileobj=writer,  # type: ignore
+                    mode='w|',
+                ) as ofile:
+                    self._addfile(ofile, paths)
+                writer.close()
+        else:
+            with tarfile.open(path_tmp, mode) as ofile:  # type: ignore
+                self._addfile(ofile, paths)
+
     def run(self) -> int:
         """
         Start program
         """
-        options = Options()
+        self._options = Options()
 
         os.umask(0o022)
-        archive = options.get_archive()
+        archive = self._options.get_archive()
         path_tmp = Path(f'{archive}.part')
 
-        if archive.endswith(('.tar.xz', '.txz', )):
-            mode = 'w:xz'
-        elif archive.endswith(('.tar.bz2', '.tbz', )):
-            mode = 'w:bz2'
-        elif archive.endswith(('.tar.gz', '.tgz', )):
-            mode = 'w:gz'
-        elif archive.endswith('.tar'):
-            mode = 'w'
-        else:
-            raise SystemExit(
-                f'{sys.argv[0]}: Unsupported "{archive}" archive format.'
-            )
-
         try:
-            with tarfile.open(path_tmp, mode) as ofile:  # type: ignore
-                self._addfile(ofile, [Path(x) for x in options.get_files()])
+            self._create(archive, path_tmp)
         except OSError as exception:
             raise SystemExit(
                 f'{sys.argv[0]}: Cannot create "{archive}.part" archive file.',
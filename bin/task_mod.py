@@ -9,14 +9,19 @@ import functools
 import getpass
 import os
 import re
+import select
 import signal
 import subprocess
 import sys
+import time
 from pathlib import Path
-from typing import List
+from typing import List, Sequence
 
-RELEASE = '2.5.2'
-VERSION = 20250223
+if os.name != 'nt':
+    import pwd
+
+RELEASE = '2.6.0'
+VERSION = 20261019
 
 
 class Tasks:
@@ -362,6 +367,153 @@ class WindowsTasks(Tasks):
         self.killpids([pgid], signame=signame)
 
 
+class Waiter:
+    """
+    This class waits for processes to exit.
+
+    Linux uses pidfd exit events and "/proc" scans for program names.
+    Other systems poll with "Tasks" every interval.
+    """
+
+    def __init__(self, user: str = None, interval: float = 1.) -> None:
+        """
+        user = Username or '<all>'
+        interval = Polling interval in seconds when events not supported
+        """
+        self._user = user if user else _System.get_username()
+        self._interval = interval
+        self._pidfds: dict = {}
+        self._polled: set = set()
+        self._proc = Path('/proc/self/cmdline').is_file()
+        self._uid = None
+        if self._proc and self._user != '<all>':
+            try:
+                # pylint: disable=possibly-used-before-assignment
+                self._uid = pwd.getpwnam(self._user).pw_uid
+                # pylint: enable=possibly-used-before-assignment
+            except KeyError:
+                self._proc = False
+
+    def _track(self, pid: int) -> bool:
+        if pid in self._pidfds or pid in self._polled:
+            return True
+        try:
+            self._pidfds[pid] = os.pidfd_open(pid)  # type: ignore
+        except ProcessLookupError:
+            return False
+        except (AttributeError, OSError):
+            if not self._exists(pid):
+                return False
+            self._polled.add(pid)
+        return True
+
+    @staticmethod
+    def _exists(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _is_alive(self, pid: int) -> bool:
+        return pid in self._pidfds or pid in self._polled
+
+    def pname2pids(self, pname: str) -> List[int]:
+        """
+        Return process ID list with program name.
+
+        pname = Program name
+        """
+        if not self._proc:
+            return Tasks.factory(self._user).pname2pids(pname)
+
+        isexist = re.compile(f'^(|[^ ]+/){pname}( |$)')
+        pids = []
+        for path in Path('/proc').iterdir():
+            if path.name.isdigit():
+                try:
+                    uid = path.stat().st_uid
+                    if self._uid is not None and uid != self._uid:
+                        continue
+                    cmdline = Path(path, 'cmdline').read_bytes()
+                except OSError:
+                    continue
+                command = cmdline.rstrip(b'\0').replace(b'\0', b' ').decode(
+                    errors='replace',
+                )
+                if isexist.search(command):
+                    pids.append(int(path.name))
+        return sorted(pids)
+
+    def _select(self, timeout: float) -> None:
+        if self._polled:
+            timeout = (
+                self._interval if timeout is None
+                else min(timeout, self._interval)
+            )
+        poller = select.poll()
+        for pidfd in self._pidfds.values():
+            poller.register(pidfd, select.POLLIN)
+        ready = {
+            pidfd
+            for pidfd, _ in poller.poll(
+                None if timeout is None else timeout * 1000
+            )
+        }
+        for pid, pidfd in list(self._pidfds.items()):
+            if pidfd in ready:
+                os.close(pidfd)
+                del self._pidfds[pid]
+        for pid in list(self._polled):
+            if not self._exists(pid):
+                self._polled.remove(pid)
+
+    def wait(
+        self,
+        pids: Sequence[int] = (),
+        pnames: Sequence[str] = (),
+        mode: str = 'all',
+        timeout: float = None,
+    ) -> bool:
+        """
+        Wait for processes to exit. Return False if timeout.
+
+        pids = List of process IDs
+        pnames = List of program names (wait until no process left)
+        mode = Wait for 'all' or 'any' of the pids/pnames
+        timeout = Seconds to wait (None for no limit)
+        """
+        if mode not in ('all', 'any'):
+            raise InvalidModeError(f'Invalid "{mode}" wait mode.')
+
+        end_time = None if timeout is None else time.monotonic() + timeout
+        for pid in pids:
+            self._track(pid)
+        try:
+            while True:
+                gone = len([x for x in pids if not self._is_alive(x)])
+                for pname in pnames:
+                    if not [
+                        x for x in self.pname2pids(pname) if self._track(x)
+                    ]:
+                        gone += 1
+                if gone == len(pids) + len(pnames) or mode == 'any' and gone:
+                    return True
+                remaining = None
+                if end_time is not None:
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                self._select(remaining)
+        finally:
+            for pidfd in self._pidfds.values():
+                os.close(pidfd)
+            self._pidfds = {}
+            self._polled = set()
+
+
 class _System:
 
     @staticmethod
@@ -451,6 +603,12 @@ class InvalidSignalError(TaskError):
     """
 
 
+class InvalidModeError(TaskError):
+    """
+    Task invalid wait mode error.
+    """
+
+
 class CommandNotFoundError(TaskError):
     """
     Command not found error.
@@ -95,6 +95,67 @@ class TestLooseVersion(unittest.TestCase):
         result = [x.get_version() for x in sorted(loose_versions)]
         self.assertEqual(result, expected)
 
+    def test_get_key(self) -> None:
+        """
+        Test getting version tokens tuple.
+        """
+        expected = ('• ', 1, '.', 2, '.', 3, '-', 4, ' •')
+
+        loose_version = command_mod.LooseVersion('1.2.3-4')
+
+        result = loose_version.get_key()
+        self.assertEqual(result, expected)
+
+    def test_compare(self) -> None:
+        """
+        Test comparisons.
+        """
+        version1 = command_mod.LooseVersion('1.2rc1')
+        version2 = command_mod.LooseVersion('1.2')
+
+        self.assertTrue(version1 < version2)
+        self.assertTrue(version1 <= version2)
+        self.assertTrue(version2 > version1)
+        self.assertTrue(version2 >= version1)
+        self.assertEqual(version2, command_mod.LooseVersion('1.2'))
+        self.assertNotEqual(version1, version2)
+        self.assertEqual(len({version2, command_mod.LooseVersion('1.2')}), 1)
+
+
+class TestVersionKey(unittest.TestCase):
+    """
+    This class tests version_key function.
+    """
+
+    def test_version_key(self) -> None:
+        """
+        Test version key orderings.
+        """
+        for older, newer in (
+            ('1.9', '1.10'),
+            ('1.0rc1', '1.0'),
+            ('1.0b2', '1.0rc1'),
+            ('1.0', '1.0-1'),
+            ('1.0', '1.0.1'),
+            ('', '1'),
+        ):
+            result = command_mod.version_key(older)
+            self.assertLess(result, command_mod.version_key(newer))
+        self.assertEqual(
+            command_mod.version_key('1.10'),
+            ('• ', 1, '.', 10, ' •'),
+        )
+
+    def test_sorting(self) -> None:
+        """
+        Test sorting with version key.
+        """
+        expected = ['1.1', '1.2b2', '1.2rc1', '1.2', '1.2+git20220418',
+                    '1.2-2', '1.2.1', '1.2a', '1.10']
+
+        result = sorted(reversed(expected), key=command_mod.version_key)
+        self.assertEqual(result, expected)
+
 
 if __name__ == '__main__':
     if '--pydoc' in sys.argv:
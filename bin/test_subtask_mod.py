@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Test module for 'subtask_mod.py' module
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import unittest.mock
+from pathlib import Path
+
+import subtask_mod
+
+STRESS = '''
+import sys
+for i in range(200000):
+    sys.stderr.write(f"error {i}\\n")
+    if i % 10 == 0:
+        sys.stdout.write(f"output {i}\\n")
+'''
+
+
+class TestBatch(unittest.TestCase):
+    """
+    This class tests Batch class.
+    """
+
+    def _run(self, target: threading.Thread) -> None:
+        target.start()
+        target.join(timeout=60)
+        self.assertFalse(target.is_alive(), 'Deadlock reading pipes')
+
+    def test_run_huge_stderr(self) -> None:
+        """
+        Test huge stderr does not block stdout capture.
+        """
+        task = subtask_mod.Batch([sys.executable, '-c', STRESS])
+
+        self._run(threading.Thread(target=task.run))
+        self.assertEqual(task.get_exitcode(), 0)
+        self.assertEqual(len(task.get_output()), 20000)
+        self.assertEqual(task.get_output()[-1], 'output 199990')
+        self.assertEqual(len(task.get_error()), 200000)
+        self.assertEqual(task.get_error()[-1], 'error 199999')
+
+    def test_run_pattern(self) -> None:
+        """
+        Test pattern selection of stdout and stderr lines.
+        """
+        task = subtask_mod.Batch([sys.executable, '-c', STRESS])
+
+        self._run(threading.Thread(
+            target=task.run,
+            kwargs={'pattern': '9999$'},
+        ))
+        self.assertEqual(task.get_output(), [])
+        self.assertEqual(
+            task.get_error(),
+            ['error 9999', 'error 19999', 'error 29999', 'error 39999',
+             'error 49999', 'error 59999', 'error 69999', 'error 79999',
+             'error 89999', 'error 99999', 'error 109999', 'error 119999',
+             'error 129999', 'error 139999', 'error 149999', 'error 159999',
+             'error 169999', 'error 179999', 'error 189999', 'error 199999'],
+        )
+
+    def test_run_partial_line(self) -> None:
+        """
+        Test output without final newline.
+        """
+        task = subtask_mod.Batch([
+            sys.executable,
+            '-c',
+            'import sys; sys.stdout.write("one\\ntwo")',
+        ])
+
+        task.run()
+        self.assertEqual(task.get_output(), ['one', 'two'])
+
+    def test_run_file(self) -> None:
+        """
+        Test stdout to file with huge stderr.
+        """
+        task = subtask_mod.Batch([sys.executable, '-c', STRESS])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, 'output.txt')
+            self._run(threading.Thread(
+                target=task.run,
+                kwargs={'file': path},
+            ))
+            lines = path.read_text().splitlines()
+        self.assertEqual(len(lines), 20000)
+        self.assertEqual(len(task.get_error()), 200000)
+
+    def test_stream(self) -> None:
+        """
+        Test streaming stdout lines.
+        """
+        task = subtask_mod.Batch([sys.executable, '-c', STRESS])
+        result = []
+
+        def _stream() -> None:
+            for line in task.stream():
+                result.append(line)
+
+        self._run(threading.Thread(target=_stream))
+        self.assertEqual(len(result), 20000)
+        self.assertEqual(result[0], 'output 0')
+        self.assertEqual(len(task.get_error()), 200000)
+        self.assertEqual(task.get_exitcode(), 0)
+
+    def test_stream_close(self) -> None:
+        """
+        Test stopping stream early.
+        """
+        task = subtask_mod.Batch([sys.executable, '-c', STRESS])
+
+        stream = task.stream()
+        self.assertEqual(next(stream), 'output 0')
+        stream.close()
+        self.assertNotEqual(task.get_exitcode(), None)
+
+
+class TestBatchPool(unittest.TestCase):
+    """
+    This class tests BatchPool class.
+    """
+
+    def test_run(self) -> None:
+        """
+        Test ordered results.
+        """
+        pool = subtask_mod.BatchPool(threads=4)
+        for i in range(10):
+            pool.add(subtask_mod.Batch([
+                sys.executable,
+                '-c',
+                f'import sys; print({i}); sys.exit({i % 2})',
+            ]))
+
+        result = pool.run()
+        self.assertEqual(result, [0, 1] * 5)
+        self.assertEqual(
+            [x.get_output() for x in pool.get_tasks()],
+            [[str(x)] for x in range(10)],
+        )
+
+    def test_run_pattern(self) -> None:
+        """
+        Test pattern, stdin and huge stderr.
+        """
+        pool = subtask_mod.BatchPool()
+        task = pool.add(
+            subtask_mod.Batch([sys.executable, '-c', STRESS]),
+            pattern='^error 1999',
+        )
+        task2 = pool.add(
+            subtask_mod.Batch([sys.executable, '-c', 'print(input())']),
+            stdin=['hello'],
+        )
+
+        pool.run()
+        self.assertEqual(task.get_output(), [])
+        self.assertEqual(len(task.get_error()), 111)
+        self.assertEqual(task2.get_output(), ['hello'])
+
+    def test_run_timeout(self) -> None:
+        """
+        Test timeout kills process.
+        """
+        pool = subtask_mod.BatchPool(timeout=0.5)
+        task = pool.add(subtask_mod.Batch([
+            sys.executable,
+            '-c',
+            'import time; time.sleep(60)',
+        ]))
+
+        pool.run()
+        self.assertNotEqual(task.get_exitcode(), 0)
+
+    def test_run_timeout_output(self) -> None:
+        """
+        Test timeout keeps output read before process is killed.
+        """
+        pool = subtask_mod.BatchPool(timeout=1)
+        task = pool.add(subtask_mod.Batch([
+            sys.executable,
+            '-c',
+            'import sys, time; print("one", flush=True); '
+            'print("two", file=sys.stderr, flush=True); time.sleep(60)',
+        ]))
+
+        pool.run()
+        self.assertNotEqual(task.get_exitcode(), 0)
+        self.assertEqual(task.get_output(), ['one'])
+        self.assertEqual(task.get_error(), ['two'])
+
+
+class TestTrace(unittest.TestCase):
+    """
+    This class tests Trace class.
+    """
+
+    def test_write(self) -> None:
+        """
+        Test trace records script name for Python interpreter.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            script = Path(tmpdir, 'hello.py')
+            script.write_text('import sys; sys.exit(3)\n')
+            trace = Path(tmpdir, 'trace.jsonl')
+            with unittest.mock.patch.dict(os.environ, {
+                'SUBTASK_MOD_TRACE': str(trace),
+            }):
+                task = subtask_mod.Batch([sys.executable, '-B', str(script)])
+                task.run()
+            record = json.loads(trace.read_text())
+        self.assertEqual(record['program'], 'hello.py')
+        self.assertEqual(record['exitcode'], 3)
+        self.assertEqual(task.get_exitcode(), 3)
+
+
+if __name__ == '__main__':
+    if '--pydoc' in sys.argv:
+        help(__name__)
+    else:
+        print(f"\n{__file__}:unittest.main(verbosity=2, buffer=True):")
+        unittest.main(verbosity=2, buffer=True)
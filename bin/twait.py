@@ -6,12 +6,11 @@ Wait for task to finish then launch command.
 import argparse
 import signal
 import sys
-import time
 from typing import List
 
 from command_mod import Command
 from subtask_mod import Exec
-from task_mod import Tasks
+from task_mod import Tasks, Waiter
 
 
 class Options:
@@ -29,17 +28,23 @@ class Options:
         """
         return self._command
 
-    def get_pid(self) -> int:
+    def get_mode(self) -> str:
         """
-        Return process ID.
+        Return wait mode ('all' or 'any').
         """
-        return self._pid
+        return 'any' if self._args.any_flag else 'all'
 
-    def get_pname(self) -> str:
+    def get_pids(self) -> List[int]:
         """
-        Return process command name.
+        Return process IDs.
         """
-        return self._pname
+        return self._pids
+
+    def get_pnames(self) -> List[str]:
+        """
+        Return process command names.
+        """
+        return self._pnames
 
     def get_user(self) -> str:
         """
@@ -47,7 +52,7 @@ class Options:
         """
         return self._args.user
 
-    def _parse_args(self, args: List[str]) -> None:
+    def _parse_args(self, args: List[str]) -> Command:
         parser = argparse.ArgumentParser(
             description="Wait for task to finish then launch command.",
         )
@@ -60,11 +65,17 @@ class Options:
             default='',
             help="Monitor any user's process.",
         )
+        parser.add_argument(
+            '-any',
+            dest='any_flag',
+            action='store_true',
+            help="Launch command when any task finishes (default all).",
+        )
         parser.add_argument(
             'task',
             nargs=1,
-            metavar='pid|pname',
-            help="Process ID or name.",
+            metavar='pid|pname[,...]',
+            help="Process IDs or names (comma separated).",
         )
         parser.add_argument(
             'command',
@@ -78,26 +89,30 @@ class Options:
             help="Command arguments.",
         )
 
-        self._args = parser.parse_args(args[:2])
+        my_args = []
+        while args:
+            my_args.append(args[0])
+            args = args[1:]
+            if not my_args[-1].startswith('-'):
+                break
+        self._args = parser.parse_args(my_args + args[:1])
+
+        return Command(self._args.command[0], args=args[1:], errors='stop')
 
     def parse(self, args: List[str]) -> None:
         """
         Parse arguments
         """
-        self._parse_args(args[1:])
+        self._command = self._parse_args(args[1:])
 
-        self._pid = 0
-        self._pname = ''
-        try:
-            self._pid = int(self._args.task[0])
-        except ValueError:
-            self._pname = self._args.task[0]
-
-        self._command = Command(
-            self._args.command[0],
-            args=args[3:],
-            errors='stop'
-        )
+        self._pids = []
+        self._pnames = []
+        for task in self._args.task[0].split(','):
+            try:
+                self._pids.append(int(task))
+            except ValueError:
+                if task:
+                    self._pnames.append(task)
 
 
 class Main:
@@ -130,15 +145,20 @@ class Main:
         options = Options()
 
         user = options.get_user()
-        pname = options.get_pname()
-
-        if pname:
-            while Tasks.factory(user).haspname(pname):
-                time.sleep(1)
-        else:
-            pid = options.get_pid()
-            while pid in Tasks.factory(user).get_pids():
-                time.sleep(1)
+        pids = options.get_pids()
+        if pids and user != '<all>':
+            tasks = Tasks.factory(user)
+            all_tasks = Tasks.factory('<all>')
+            pids = [
+                x for x in pids
+                if tasks.haspid(x) or not all_tasks.haspid(x)
+            ]
+
+        Waiter(user).wait(
+            pids=pids,
+            pnames=options.get_pnames(),
+            mode=options.get_mode(),
+        )
         Exec(options.get_command().get_cmdline()).run()
 
         return 0
@@ -1,16 +1,26 @@
 #!/usr/bin/env python3
 """
-Unpack optional compressed archive in TAR/TAR.GZ/TAR.BZ2/TAR.XZ/TGZ/TBZ/TXZ
-format (Python version).
+Unpack optional compressed archive in
+TAR/TAR.GZ/TAR.BZ2/TAR.XZ/TAR.ZST/TGZ/TBZ/TXZ/TZST format (Python version).
 """
 
 import argparse
+import bz2
+import collections
+import concurrent.futures
+import gzip
+import lzma
+import mmap
 import os
 import signal
 import sys
 import tarfile
 from pathlib import Path
-from typing import List
+from typing import Any, BinaryIO, Callable, List, Optional, Tuple
+
+import pyzstd  # type: ignore
+
+PARALLEL_MEMORY = 1073741824
 
 
 class Options:
@@ -28,6 +38,12 @@ class Options:
         """
         return self._args.archives
 
+    def get_threads(self) -> int:
+        """
+        Return number of threads.
+        """
+        return self._args.threads[0]
+
     def get_view_flag(self) -> bool:
         """
         Return view flag.
@@ -37,9 +53,17 @@ class Options:
     def _parse_args(self, args: List[str]) -> None:
         parser = argparse.ArgumentParser(
             description="Unpack an archive in "
-            "TAR/TAR.GZ/TAR.BZ2/TAR.XZ (TGZ/TBZ/TXZ) format.",
+            "TAR/TAR.GZ/TAR.BZ2/TAR.XZ/TAR.ZST (TGZ/TBZ/TXZ/TZST) format.",
         )
 
+        parser.add_argument(
+            '-threads',
+            nargs=1,
+            type=int,
+            default=[os.cpu_count() or 1],
+            help="Number of threads for multi-stream XZ/ZST archives. "
+            "Default is number of CPU cores.",
+        )
         parser.add_argument(
             '-v',
             dest='view_flag',
@@ -55,6 +79,12 @@ class Options:
 
         self._args = parser.parse_args(args)
 
+        if self._args.threads[0] < 1:
+            raise SystemExit(
+                f'{sys.argv[0]}: You must specific a positive integer '
+                'for threads.',
+            )
+
     def parse(self, args: List[str]) -> None:
         """
         Parse arguments
@@ -62,6 +92,149 @@ class Options:
         self._parse_args(args[1:])
 
 
+class ParallelReader:
+    """
+    Parallel decompressor file object for multi-stream XZ/ZST files.
+
+    Ranges are (start, end, uncompressed size) and decompressed data in
+    flight is limited to PARALLEL_MEMORY bytes.
+    """
+
+    def __init__(
+        self,
+        data: mmap.mmap,
+        ranges: List[Tuple[int, int, int]],
+        decompress: Callable[[bytes], bytes],
+        threads: int,
+    ) -> None:
+        self._data = data
+        self._ranges = collections.deque(ranges)
+        self._decompress = decompress
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=threads,
+        )
+        self._pending: collections.deque = collections.deque()
+        self._max_pending = threads * 2
+        self._block = memoryview(b'')
+        self._fill()
+
+    @staticmethod
+    def is_bounded(ranges: List[Tuple[int, int, int]]) -> bool:
+        """
+        Return True if every stream has known size that fits in memory.
+        """
+        return all(0 <= x[2] <= PARALLEL_MEMORY for x in ranges)
+
+    def _fill(self) -> None:
+        while self._ranges and len(self._pending) < self._max_pending:
+            start, end, size = self._ranges[0]
+            if self._pending and size + sum(
+                x[1] for x in self._pending
+            ) > PARALLEL_MEMORY:
+                break
+            self._pending.append((
+                self._executor.submit(self._unpack, start, end),
+                size,
+            ))
+            self._ranges.popleft()
+
+    def _unpack(self, start: int, end: int) -> bytes:
+        return self._decompress(self._data[start:end])
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read decompressed data.
+        """
+        chunks = []
+        while size != 0:
+            if not self._block:
+                if not self._pending:
+                    break
+                self._block = memoryview(self._pending[0][0].result())
+                self._pending.popleft()
+                self._fill()
+                continue
+            nbytes = len(self._block) if size < 0 else size
+            chunks.append(self._block[:nbytes])
+            self._block = self._block[nbytes:]
+            if size > 0:
+                size -= len(chunks[-1])
+        return b''.join(chunks)
+
+    def close(self) -> None:
+        """
+        Stop decompression threads.
+        """
+        for future, _ in self._pending:
+            future.cancel()
+        self._executor.shutdown()
+        self._data.close()
+
+    @staticmethod
+    def _varint(data: mmap.mmap, position: int) -> Tuple[int, int]:
+        value = 0
+        shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                return value, position
+            shift += 7
+
+    @classmethod
+    def split_xz(cls, data: mmap.mmap) -> List[Tuple[int, int, int]]:
+        """
+        Return XZ stream ranges and sizes using stream footers and indexes.
+        """
+        ranges = []
+        end = len(data)
+        while end > 0:
+            while end >= 4 and data[end-4:end] == b'\0\0\0\0':  # Padding
+                end -= 4
+            if end < 24 or data[end-2:end] != b'YZ':
+                raise lzma.LZMAError('Invalid XZ stream footer')
+            index = end - 12 - (
+                int.from_bytes(data[end-8:end-4], 'little') + 1
+            ) * 4
+            if index < 12 or data[index] != 0:
+                raise lzma.LZMAError('Invalid XZ stream index')
+            nrecords, position = cls._varint(data, index + 1)
+            blocks = 0
+            size = 0
+            for _ in range(nrecords):
+                unpadded_size, position = cls._varint(data, position)
+                uncompressed_size, position = cls._varint(data, position)
+                blocks += (unpadded_size + 3) // 4 * 4
+                size += uncompressed_size
+            start = index - blocks - 12
+            if start < 0:
+                raise lzma.LZMAError('Invalid XZ stream index')
+            ranges.append((start, end, size))
+            end = start
+        return ranges[::-1]
+
+    @staticmethod
+    def split_zst(data: mmap.mmap) -> List[Tuple[int, int, int]]:
+        """
+        Return ZST frame ranges and sizes (-1 if unknown) using frame headers.
+        """
+        ranges = []
+        view = memoryview(data)
+        start = 0
+        try:
+            while start < len(data):
+                # pylint: disable=no-member
+                end = start + pyzstd.get_frame_size(view[start:])
+                size = pyzstd.get_frame_info(view[start:end]).decompressed_size
+                # pylint: enable=no-member
+                ranges.append((start, end, -1 if size is None else size))
+                start = end
+        finally:
+            view.release()
+        return ranges
+
+
 class Main:
     """
     Main class
@@ -94,7 +267,8 @@ class Main:
 
     @staticmethod
     def _unpack(archive: tarfile.TarFile) -> None:
-        for path in [Path(x) for x in archive.getnames()]:
+        for member in archive:
+            path = Path(member.name)
             print(path)
             if path.is_absolute():
                 raise SystemExit(
@@ -107,7 +281,7 @@ class Main:
                     'path outside of current directory.'
                 )
             try:
-                archive.extract(archive.getmember(str(path)))
+                archive.extract(member)
             except OSError as exception:
                 raise SystemExit(
                     f'{sys.argv[0]}: Unable to create "{path}" extracted.',
@@ -121,35 +295,90 @@ class Main:
     def _view(archive: tarfile.TarFile) -> None:
         archive.list()
 
-    @classmethod
-    def run(cls) -> int:
+    def _open_parallel(
+        self,
+        ifile: BinaryIO,
+        split: Callable[[mmap.mmap], List[Tuple[int, int, int]]],
+        decompress: Callable[[bytes], bytes],
+    ) -> Optional[ParallelReader]:
+        threads = self._options.get_threads()
+        if threads > 1:
+            data = mmap.mmap(ifile.fileno(), 0, access=mmap.ACCESS_READ)
+            ranges = split(data)
+            if len(ranges) > 1 and ParallelReader.is_bounded(ranges):
+                return ParallelReader(data, ranges, decompress, threads)
+            data.close()
+        return None
+
+    def _open(self, file: str, ifile: BinaryIO) -> Any:
+        """
+        Return stream file object for tarfile.
+        """
+        if file.endswith(('.tar.bz2', '.tbz', )):
+            return bz2.BZ2File(ifile)
+        if file.endswith(('.tar.gz', '.tgz', )):
+            return gzip.GzipFile(fileobj=ifile)
+        if file.endswith(('.tar.xz', '.txz', )):
+            return self._open_parallel(
+                ifile,
+                ParallelReader.split_xz,
+                lzma.decompress,
+            ) or lzma.LZMAFile(ifile)
+        if file.endswith(('.tar.zst', '.tar.zstd', '.tzs', '.tzst')):
+            return self._open_parallel(
+                ifile,
+                ParallelReader.split_zst,
+                pyzstd.decompress,  # pylint: disable=no-member
+            ) or pyzstd.ZstdFile(ifile)  # pylint: disable=no-member
+        return ifile
+
+    def run(self) -> int:
         """
         Start program
         """
-        options = Options()
-
-        for file in options.get_archives():
-            if file.endswith(('.tar.xz', '.txz', )):
-                mode = 'r:xz'
-            elif file.endswith(('.tar.bz2', '.tbz', )):
-                mode = 'r:bz2'
-            elif file.endswith(('.tar.gz', '.tgz', )):
-                mode = 'r:gz'
-            elif file.endswith('.tar'):
-                mode = 'r'
-            else:
+        self._options = Options()
+
+        for file in self._options.get_archives():
+            if not file.endswith((
+                '.tar',
+                '.tar.bz2',
+                '.tbz',
+                '.tar.gz',
+                '.tgz',
+                '.tar.xz',
+                '.txz',
+                '.tar.zst',
+                '.tar.zstd',
+                '.tzs',
+                '.tzst',
+            )):
                 raise SystemExit(
                     f'{sys.argv[0]}: Unsupported "{file}" archive format.',
                 )
 
             print(f"{file}:")
             try:
-                with tarfile.open(file, mode) as archive:  # type: ignore
-                    if options.get_view_flag():
-                        cls._view(archive)
-                    else:
-                        cls._unpack(archive)
-            except OSError as exception:
+                with Path(file).open('rb') as ifile:
+                    stream = self._open(file, ifile)
+                    try:
+                        with tarfile.open(
+                            fileobj=stream,
+                            mode='r|',
+                        ) as archive:
+                            if self._options.get_view_flag():
+                                self._view(archive)
+                            else:
+                                self._unpack(archive)
+                    finally:
+                        if stream is not ifile:
+                            stream.close()
+            except (
+                OSError,
+                ValueError,
+                lzma.LZMAError,
+                pyzstd.ZstdError,  # pylint: disable=no-member
+                tarfile.TarError,
+            ) as exception:
                 raise SystemExit(
                     f'{sys.argv[0]}: Cannot open "{file}" archive file.',
                 ) from exception
@@ -4,6 +4,7 @@ Convert BSON/JSON/XML/YAML to YAML file.
 """
 
 import argparse
+import filecmp
 import os
 import signal
 import sys
@@ -105,27 +106,28 @@ class Main:
         data = Data()
 
         for path in paths:
+            yaml_path = path.with_suffix('.yaml')
+            tmp_path = Path(f'{yaml_path}.part')
             try:
-                data.read(path)
+                data.iwrite(tmp_path, data.iread(path), config='YAML')
             except ReadConfigError as exception:
                 raise SystemExit(f"{path}: {exception}") from exception
-            yaml_path = path.with_suffix('.yaml')
-            try:
-                old_yaml = yaml_path.read_bytes()
-            except (ConfigError, OSError):
-                old_yaml = None
-            new_yaml = data.encode(config='YAML')
-            if new_yaml != old_yaml:
+            except ConfigError as exception:
+                raise SystemExit(
+                    f'{sys.argv[0]}: Cannot create "{yaml_path}" file.'
+                ) from exception
+            if yaml_path.is_file() and filecmp.cmp(
+                tmp_path,
+                yaml_path,
+                shallow=False,
+            ):
+                tmp_path.unlink()
+            else:
                 if path == yaml_path:
                     print(f'Formatting "{path}" to "{yaml_path}"...')
                 else:
                     print(f'Converting "{path}" to "{yaml_path}"...')
-                try:
-                    yaml_path.write_bytes(new_yaml)
-                except OSError as exception:
-                    raise SystemExit(
-                        f'{sys.argv[0]}: Cannot create "{yaml_path}" file.'
-                    ) from exception
+                tmp_path.replace(yaml_path)
 
     @classmethod
     def run(cls) -> int:
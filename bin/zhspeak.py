@@ -2,26 +2,28 @@
 """
 Zhong Hua Speak Chinese TTS software.
 
-2009-2024 By Dr Colin Kong
+2009-2026 By Dr Colin Kong
 """
 
 import argparse
-import json
+import marshal
 import os
 import re
 import signal
+import subprocess
 import sys
 import time
+import wave
 from pathlib import Path
-from typing import Generator, List
+from typing import Dict, Generator, List, Optional
 
 from command_mod import Command
 from file_mod import FileUtil
-from subtask_mod import Batch, Exec, ExecutableCallError, Task
+from subtask_mod import Batch, Child, Exec, ExecutableCallError, Task
 from task_mod import Tasks
 
-RELEASE = '6.3.0'
-VERSION = 20241021
+RELEASE = '6.4.0'
+VERSION = 20261019
 
 
 class Options:
@@ -70,6 +72,12 @@ class Options:
         """
         return self._tmp_path
 
+    def get_wav_file(self) -> Optional[Path]:
+        """
+        Return WAV output file.
+        """
+        return Path(self._args.wav_file[0]) if self._args.wav_file else None
+
     def _parse_args(self, args: List[str]) -> None:
         parser = argparse.ArgumentParser(
             description=f"Zhong Hua Speak "
@@ -102,6 +110,13 @@ class Options:
             dest='gui_flag',
             help="Start GUI (zhspeak.tcl).",
         )
+        parser.add_argument(
+            '-wav',
+            nargs=1,
+            dest='wav_file',
+            metavar='file.wav',
+            help="Write Chinese speech to WAV file instead of playing.",
+        )
         parser.add_argument(
             '-de',
             action='store_const',
@@ -270,39 +285,75 @@ class Chinese(Language):
         super().__init__(options)
 
         self._options = options
-        self._directory = Path(
+        directory = Path(
             options.get_speak_dir(),
             f'{options.get_dialect()}_dir',
         )
         self._dictionary = ChineseDictionary(self._options)
-
-        self._player = AudioPlayer.factory(self._directory)
-        if not self._player:
+        self._engine = SoundEngine(directory)
+        self._pcm: List[bytes] = []
+        self._stream: subprocess.Popen = None
+
+        self._player = AudioPlayer.factory(directory)
+        if options.get_wav_file():
+            if not self._engine.is_found():
+                raise SystemExit(f'{sys.argv[0]}: Cannot find "ffmpeg".')
+        elif not self._player:
             raise SystemExit(
                 f'{sys.argv[0]}: Cannot find "vlc", '
                 '"ffplay" (libav-tools) or "avplay" (ffmpeg).',
             )
         self._is_found = True
 
+    def _play(self, files: List[str]) -> None:
+        # Pause after every 100 words if no punctuation marks
+        for i in range(0, len(files), 10):
+            exitcode = self._player.run(files[i:i + 10])
+            if exitcode:
+                raise SystemExit(
+                    f'{sys.argv[0]}: Error code {exitcode} received '
+                    f'from "{self._player.get_player()}".',
+                )
+            time.sleep(0.25)
+
     def _speak(self, sounds: List[str]) -> None:
-        files = []
-        for sound in sounds:
-            if Path(self._directory, f'{sound}.mp3').is_file():
-                files.append(f'{sound}.mp3')
-            elif Path(self._directory, f'{sound}.ogg').is_file():
-                files.append(f'{sound}.ogg')
-            elif Path(self._directory, f'{sound}.wav').is_file():
-                files.append(f'{sound}.wav')
-        if files:
-            # Pause after every 100 words if no punctuation marks
-            for i in range(0, len(files), 10):
-                exitcode = self._player.run(files[i:i + 10])
-                if exitcode:
-                    raise SystemExit(
-                        f'{sys.argv[0]}: Error code {exitcode} received '
-                        f'from "{self._player.get_player()}".',
-                    )
-                time.sleep(0.25)
+        files = [x for x in map(self._engine.get_file, sounds) if x]
+        if not files:
+            return
+        if not self._engine.is_found():
+            self._play(files)
+            return
+
+        # Phrase audio with pause for punctuation marks
+        pcm = self._engine.get_pcm(files) + self._engine.get_silence(0.25)
+        if self._options.get_wav_file():
+            self._pcm.append(pcm)
+            return
+        if not self._stream:
+            self._stream = self._player.stream()
+            self._stream.stdin.write(self._engine.get_wav_header())
+        try:
+            self._stream.stdin.write(pcm)
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot write to '
+                f'"{self._player.get_player()}".',
+            ) from exception
+
+    def _finish(self) -> None:
+        if self._options.get_wav_file():
+            self._engine.write_wav(self._options.get_wav_file(), self._pcm)
+        elif self._stream:
+            try:
+                self._stream.stdin.close()
+            except OSError:
+                pass
+            exitcode = self._stream.wait()
+            if exitcode:
+                raise SystemExit(
+                    f'{sys.argv[0]}: Error code {exitcode} received '
+                    f'from "{self._player.get_player()}".',
+                )
 
     def text2speech(self, text: List[str]) -> None:
         """
@@ -313,11 +364,172 @@ class Chinese(Language):
                 if not self._options.get_pinyin_flag():
                     self._speak(sounds)
                 print(" ".join(sounds))
+        self._finish()
+
+
+class SoundEngine:
+    """
+    Sound engine class (assembles voice clips as 16bit mono PCM)
+    """
+
+    RATE = 44100
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._files: Dict[str, str] = {}
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            names = []
+        for extension in ('.wav', '.ogg', '.mp3'):  # Last has priority
+            for name in names:
+                if name.endswith(extension):
+                    self._files[name[:-len(extension)]] = name
+        self._ffmpeg = Command('ffmpeg', errors='ignore')
+        self._ffmpeg.set_args(['-v', 'error', '-nostdin', '-i'])
+        self._cache_dir = Path(
+            FileUtil.tmpdir(Path('.cache', 'zhspeak', directory.name)),
+        )
+        self._cache: Dict[str, bytes] = {}
+
+    def is_found(self) -> bool:
+        """
+        Return True if all voice clips can be decoded.
+        """
+        return self._ffmpeg.is_found() or all(
+            x.endswith('.wav') for x in self._files.values()
+        )
+
+    def get_file(self, sound: str) -> str:
+        """
+        Return voice clip file for sound (blank if not found).
+        """
+        return self._files.get(sound, '')
+
+    @classmethod
+    def _read_wav(cls, path: Path) -> Optional[bytes]:
+        try:
+            with wave.open(str(path), 'rb') as ifile:
+                if (
+                    ifile.getnchannels() == 1 and
+                    ifile.getsampwidth() == 2 and
+                    ifile.getframerate() == cls.RATE
+                ):
+                    return ifile.readframes(ifile.getnframes())
+        except (OSError, EOFError, wave.Error):
+            pass
+        return None
+
+    def _decode(self, path: Path) -> bytes:
+        if not self._ffmpeg.is_found():
+            raise SystemExit(f'{sys.argv[0]}: Cannot find "ffmpeg".')
+        task = Child(self._ffmpeg.get_cmdline() + [
+            path,
+            '-f',
+            's16le',
+            '-ac',
+            '1',
+            '-ar',
+            str(self.RATE),
+            '-',
+        ])
+        child = task.run()
+        child.stdin.close()
+        pcm = child.stdout.read()
+        child.stderr.read()
+        if child.wait():
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot decode "{path}" voice file.',
+            )
+        return pcm
+
+    def _load(self, file: str) -> bytes:
+        path = Path(self._directory, file)
+        if path.suffix == '.wav':
+            pcm = self._read_wav(path)
+            if pcm is not None:
+                return pcm
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot find "{path}" voice file.',
+            ) from exception
+        path_cache = Path(self._cache_dir, f'{file}-{mtime}.pcm')
+        try:
+            return path_cache.read_bytes()
+        except OSError:
+            pass
+
+        pcm = self._decode(path)
+        path_tmp = Path(f'{path_cache}.part')
+        try:
+            path_tmp.write_bytes(pcm)
+            path_tmp.replace(path_cache)
+        except OSError:
+            pass
+        return pcm
+
+    def get_pcm(self, files: List[str]) -> bytes:
+        """
+        Return concatenated PCM data for voice clip files.
+        """
+        for file in files:
+            if file not in self._cache:
+                self._cache[file] = self._load(file)
+        return b''.join(self._cache[x] for x in files)
+
+    @classmethod
+    def get_silence(cls, seconds: float) -> bytes:
+        """
+        Return PCM data for silence.
+        """
+        return bytes(int(cls.RATE * seconds) * 2)
+
+    @classmethod
+    def get_wav_header(cls, size: int = 0xffffffff - 36) -> bytes:
+        """
+        Return WAV header (default size for stream of unknown length).
+        """
+        return b''.join([
+            b'RIFF',
+            (size + 36).to_bytes(4, 'little'),
+            b'WAVEfmt ',
+            (16).to_bytes(4, 'little'),
+            (1).to_bytes(2, 'little'),  # PCM
+            (1).to_bytes(2, 'little'),  # Mono
+            cls.RATE.to_bytes(4, 'little'),
+            (cls.RATE * 2).to_bytes(4, 'little'),
+            (2).to_bytes(2, 'little'),
+            (16).to_bytes(2, 'little'),
+            b'data',
+            size.to_bytes(4, 'little'),
+        ])
+
+    @classmethod
+    def write_wav(cls, path: Path, pcm: List[bytes]) -> None:
+        """
+        Write PCM data to WAV file.
+        """
+        path_tmp = Path(f'{path}.part')
+        try:
+            with path_tmp.open('wb') as ofile:
+                ofile.write(cls.get_wav_header(sum(len(x) for x in pcm)))
+                for chunk in pcm:
+                    ofile.write(chunk)
+            path_tmp.replace(path)
+        except OSError as exception:
+            raise SystemExit(
+                f'{sys.argv[0]}: Cannot create "{path}" WAV file.',
+            ) from exception
 
 
 class ChineseDictionary:
     """
     Chinese dictionary class
+
+    Compiled dictionary (marshal) maps text to space separated sounds and
+    every proper prefix of text to None (for longest prefix matching).
     """
 
     def __init__(self, options: Options) -> None:
@@ -326,61 +538,55 @@ class ChineseDictionary:
         self._issound = re.compile(r'[A-Z]$|[a-z]+\d+')
 
         path = (
-            Path(options.get_speak_dir(), 'zhy.json')
+            Path(options.get_speak_dir(), 'zhy.dict')
             if options.get_dialect() == 'zhy'
-            else Path(options.get_speak_dir(), 'zh.json')
+            else Path(options.get_speak_dir(), 'zh.dict')
         )
-        if not path.is_file():
-            self.create_cache()
+        try:
+            self._mappings = marshal.loads(path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            self.create_cache()  # Missing or from other Python version
+            try:
+                self._mappings = marshal.loads(path.read_bytes())
+            except (OSError, EOFError, ValueError, TypeError) as exception:
+                raise SystemExit(
+                    f'{sys.argv[0]}: Cannot open "{path}" dialect file.',
+                ) from exception
 
+    def _write_cache(self, path: Path) -> None:
+        print(f'Creating "{path}"...')
+        cache: dict = {}
+        for text in self._mappings:
+            for i in range(1, len(text)):
+                cache.setdefault(text[:i], None)
+        for text, sounds in self._mappings.items():
+            cache[text] = ' '.join(sounds)
         try:
-            self._mappings = json.loads(path.read_text(errors='replace'))
+            with path.open('wb') as ofile:
+                marshal.dump(cache, ofile)
         except OSError as exception:
             raise SystemExit(
-                f'{sys.argv[0]}: Cannot open "{path}" dialect file.',
+                f'{sys.argv[0]}: Cannot create "{path}" file.',
             ) from exception
-        self._max_block = max(len(key) for key in self._mappings)
 
     def create_cache(self) -> None:
         """
-        Create JSON cache files
+        Create compiled dictionary cache files
         """
         directory = self._options.get_speak_dir()
 
-        path = Path(directory, 'zh.json')
-        print(f'Creating "{path}"...')
         self._mappings = {}
         self.readmap(Path(directory, 'en_list'))
         self.readmap(Path(directory, 'zh_list'))
         self.readmap(Path(directory, 'zh_listx'))
         self.readmap(Path(directory, 'zh_listck'))
-        try:
-            with path.open('w') as ofile:
-                print(
-                    json.dumps(self._mappings, ensure_ascii=False),
-                    file=ofile,
-                )
-        except OSError as exception:
-            raise SystemExit(
-                f'{sys.argv[0]}: Cannot create "{path}" file.',
-            ) from exception
+        self._write_cache(Path(directory, 'zh.dict'))
 
-        path = Path(directory, 'zhy.json')
-        print(f'Creating "{path}"...')
         self._mappings = {}
         self.readmap(Path(directory, 'en_list'))
         self.readmap(Path(directory, 'zhy_list'))
         self.readmap(Path(directory, 'zhy_listck'))
-        try:
-            with path.open('w') as ofile:
-                print(
-                    json.dumps(self._mappings, ensure_ascii=False),
-                    file=ofile,
-                )
-        except OSError as exception:
-            raise SystemExit(
-                f'{sys.argv[0]}: Cannot create "{path}" file.',
-            ) from exception
+        self._write_cache(Path(directory, 'zhy.dict'))
 
     def readmap(self, path: Path) -> None:
         """
@@ -404,16 +610,26 @@ class ChineseDictionary:
 
     def map_speech(self, text: str) -> Generator[List[str], None, None]:
         """
-        Map Speech
+        Map Speech (single pass longest prefix match)
         """
         i = 0
-        sounds = []
-        while i < len(text):
-            for blocksize in range(self._max_block, 0, -1):
-                if text[i:i + blocksize] in self._mappings:
-                    sounds.extend(self._mappings[text[i:i + blocksize]])
-                    i += blocksize
+        size = len(text)
+        sounds: List[str] = []
+        while i < size:
+            match = 0
+            block = ''
+            j = i + 1
+            while j <= size:
+                value = self._mappings.get(text[i:j], False)
+                if value is False:
                     break
+                if value is not None:
+                    match = j
+                    block = value
+                j += 1
+            if match:
+                sounds.extend(block.split())
+                i = match
             else:
                 if sounds:
                     # Break speech for non text like punctuation marks
@@ -568,6 +784,23 @@ class AudioPlayer:
         task.run(directory=self._directory)
         return task.get_exitcode()
 
+    def stream(self) -> subprocess.Popen:
+        """
+        Start player reading WAV stream from stdin.
+        """
+        cmdline = self._player.get_cmdline() + ['-']
+        try:
+            return subprocess.Popen(  # pylint: disable=consider-using-with
+                cmdline,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as exception:
+            raise ExecutableCallError(
+                f'Error in calling "{cmdline[0]}" program.',
+            ) from exception
+
 
 class Vlc(AudioPlayer):
     """
@@ -593,7 +826,7 @@ class Ffplay(AudioPlayer):
 
     def _config(self) -> None:
         self._player = Command('ffplay', errors='ignore')
-        self._player.set_args(['-nodisp', '-autoexit', '-i'])
+        self._player.set_args(['-nodisp', '-autoexit', '-nostats', '-i'])
 
     def run(self, files: List[str]) -> int:
         """